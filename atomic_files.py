@@ -0,0 +1,27 @@
+import contextlib  # For ignoring a temporary file the writer already removed
+import os  # For atomic file replacement and permissions
+import tempfile  # For writing files before publishing them
+
+# ====================== ATOMIC FILE WRITES ======================
+# Model artifacts, caches, the metrics file and generated assets are read by
+# other threads and processes while they are rewritten. Every writer goes
+# through write_atomic: the content is written to a temporary file in the
+# target's directory and renamed over the target, so readers see either the
+# old file or the new one, never a partial write.
+
+
+def write_atomic(path, write_fn):
+    """Calls write_fn(tmp_path), then moves the file to path atomically; returns path"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        write_fn(tmp_path)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates owner-only files
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
+    return path
@@ -0,0 +1,151 @@
+"""Offline batch scoring for whole cohorts of respondents.
+
+Reads a CSV, XLSX or Parquet file with one row of raw answers per respondent,
+using the same vocabulary as the questionnaire (e.g. "High", "Independent",
+"Yes", numeric GPA), and writes the predicted career with its top-k
+probabilities. Rows are read, encoded, scored and written chunk by chunk, so
+memory stays bounded regardless of the input size.
+
+    python batch_score.py answers.csv predictions.csv --top-k 3
+"""
+import argparse  # For the command-line interface
+import os  # For file extensions
+import sys  # For stdout output and exit codes
+
+import pandas as pd  # For chunked I/O
+
+import data_cache  # For the columnar cache of the training spreadsheet
+import model_registry  # For loading (or training once) the shared model
+from career_model import (
+    ASSESSMENT_DATA_PATH, ASSESSMENT_MODEL, ASSESSMENT_SHEET, assessment_params,
+    fit_model_bundle, top_careers,
+)
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+# ====================== INPUT ======================
+def iter_answer_chunks(path, chunk_size, columns=None):
+    """Yields DataFrames of at most chunk_size answer rows from a CSV, XLSX or Parquet file"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns)
+    elif ext == ".parquet":
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    elif ext in (".xlsx", ".xlsm"):
+        yield from _iter_excel_chunks(path, chunk_size, columns)
+    else:
+        raise ValueError(f"Unsupported input format: {ext or path}")
+
+
+def _iter_excel_chunks(path, chunk_size, columns):
+    # openpyxl's read-only mode streams rows instead of loading the whole sheet
+    import openpyxl
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(name) for name in next(rows)]
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) == chunk_size:
+                yield _excel_frame(buffer, header, columns)
+                buffer = []
+        if buffer:
+            yield _excel_frame(buffer, header, columns)
+    finally:
+        workbook.close()
+
+
+def _excel_frame(rows, header, columns):
+    frame = pd.DataFrame(rows, columns=header)
+    return frame if columns is None else frame[columns]
+
+
+# ====================== SCORING ======================
+def score_chunk(answers, bundle, top_k, id_column=None):
+    """Returns the predictions for one chunk of raw answers"""
+    X = bundle.preprocessor.transform(answers, bundle.selected_features)
+    careers, probabilities = top_careers(bundle.tree.predict_proba(X), bundle, top_k)
+
+    result = {}
+    if id_column is not None:
+        result[id_column] = answers[id_column].to_numpy()
+    result["predicted_career"] = careers[:, 0]
+    for rank in range(careers.shape[1]):
+        # A string dtype even when a chunk has no career at this rank, so Parquet chunks share one schema
+        result[f"career_{rank + 1}"] = pd.array(careers[:, rank], dtype="str")
+        result[f"probability_{rank + 1}"] = probabilities[:, rank]
+    return pd.DataFrame(result, index=answers.index)
+
+
+# ====================== OUTPUT ======================
+class ResultWriter:
+    """Appends scored chunks to a CSV (or stdout with "-") or Parquet file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet_writer = None
+        self._wrote_header = False
+
+    def write(self, frame):
+        if self.path.lower().endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            target = sys.stdout if self.path == "-" else self.path
+            mode = "a" if self._wrote_header else "w"
+            frame.to_csv(target, mode=mode, header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+# ====================== CLI ======================
+def load_bundle(train_data, sheet_name):
+    """Loads the assessment model from the registry, training it once if needed"""
+    df = data_cache.read_excel_cached(train_data, sheet_name=sheet_name)
+    return model_registry.load_or_train(ASSESSMENT_MODEL, df, assessment_params(), fit_model_bundle)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a file of questionnaire answers in bulk.")
+    parser.add_argument("input", help="CSV, XLSX or Parquet file with one respondent per row")
+    parser.add_argument("output", help="CSV or Parquet file to write, or - for CSV on stdout")
+    parser.add_argument("--top-k", type=int, default=3, help="Number of ranked careers to output")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows scored at a time")
+    parser.add_argument("--id-column", help="Input column copied to the output to identify respondents")
+    parser.add_argument("--train-data", default=ASSESSMENT_DATA_PATH, help="Spreadsheet the model is trained on")
+    parser.add_argument("--sheet", default=ASSESSMENT_SHEET, help="Sheet of --train-data to use")
+    args = parser.parse_args(argv)
+    if args.top_k < 1 or args.chunk_size < 1:
+        parser.error("--top-k and --chunk-size must be positive")
+
+    bundle = load_bundle(args.train_data, args.sheet)
+    columns = list(bundle.selected_features)
+    if args.id_column:
+        columns.append(args.id_column)
+
+    writer = ResultWriter(args.output)
+    scored = 0
+    try:
+        for chunk in iter_answer_chunks(args.input, args.chunk_size, columns):
+            writer.write(score_chunk(chunk, bundle, args.top_k, args.id_column))
+            scored += len(chunk)
+    finally:
+        writer.close()
+    print(f"Scored {scored} respondents with model {bundle.version}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
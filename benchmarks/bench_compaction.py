@@ -0,0 +1,108 @@
+"""Training on deduplicated rows: checks the model is unchanged and measures what it saves.
+
+Trains the career model with train_model twice per dataset and tree setting,
+once on every training row (compact=False) and once on the identical rows
+collapsed into sample weights, then checks that both trees are identical
+(structure, thresholds, leaf values, importances) and predict the same career
+for every row. Reports the share of unique rows and, for both fits, the wall
+time and the peak memory allocated while fitting (tracemalloc).
+
+    bundled      the bundled spreadsheet
+    resampled    its rows drawn with replacement up to --rows (repetitive survey data)
+    synthetic    synthetic_data.py rows with --correlation (few exact repeats)
+
+Exits with status 1 if any pair of models differs:
+
+    python benchmarks/bench_compaction.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import model_registry  # noqa: E402
+from career_model import ASSESSMENT_PARAMS, compact_rows, feature_ranking, preprocess_data, train_model  # noqa: E402
+from preprocessing import TARGET  # noqa: E402
+from synthetic_data import CAREERS, SyntheticCareerData  # noqa: E402
+
+BUNDLED_DATA = os.path.join(ROOT, "new_updated_data.xlsx")
+TREE_SETTINGS = [{}, {"max_depth": 8, "criterion": "entropy"}]
+TREE_ARRAYS = ("children_left", "children_right", "feature", "threshold", "value", "impurity",
+               "weighted_n_node_samples")
+
+
+def datasets(rows, correlation):
+    bundled = pd.read_excel(BUNDLED_DATA)
+    yield "bundled", bundled
+    yield f"resampled-{rows}", bundled.sample(rows, replace=True, random_state=0, ignore_index=True)
+    generator = SyntheticCareerData(len(CAREERS), noise=0.1, correlation=correlation)
+    yield f"synthetic-{rows}", generator.frame(rows)
+
+
+def timed_fit(fn):
+    """Returns fn's result, wall seconds and peak traced allocation in MB"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = fn()
+        return result, time.perf_counter() - start, tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def same_model(a, b):
+    """True if two fitted trees are identical"""
+    return (all(np.array_equal(getattr(a.tree_, name), getattr(b.tree_, name)) for name in TREE_ARRAYS)
+            and np.array_equal(a.feature_importances_, b.feature_importances_))
+
+
+def compare(args):
+    """Prints the comparison table and returns the number of models that differ"""
+    mismatches = 0
+    print(f"{'dataset':<20}{'setting':<30}{'unique':>8}{'full s':>9}{'compact s':>11}"
+          f"{'full MB':>9}{'compact MB':>12}  identical")
+    for name, df in datasets(args.rows, args.correlation):
+        df_processed, _ = preprocess_data(df)
+        X = df_processed.drop(TARGET, axis=1)
+        y = df_processed[TARGET]
+        feature_ranking(X, y)  # Cached, so both fits below time the final model only
+        unique = len(compact_rows(X, y)[2]) / len(X)
+        for params in TREE_SETTINGS:
+            (full, features), full_s, full_mb = timed_fit(
+                lambda: train_model(X, y, n_features=args.n_features, compact=False, **params))
+            (compact, _), compact_s, compact_mb = timed_fit(
+                lambda: train_model(X, y, n_features=args.n_features, **params))
+            identical = same_model(full, compact) and np.array_equal(
+                full.predict(X[features]), compact.predict(X[features]))
+            mismatches += not identical
+            setting = ", ".join(f"{key}={value}" for key, value in params.items()) or "defaults"
+            print(f"{name:<20}{setting:<30}{unique:>8.1%}{full_s:>9.2f}{compact_s:>11.2f}"
+                  f"{full_mb:>9.0f}{compact_mb:>12.0f}  {'yes' if identical else 'NO'}")
+    return mismatches
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000, help="Rows of the resampled and synthetic datasets")
+    parser.add_argument("--correlation", type=float, default=0.9, help="Correlation of the synthetic dataset")
+    parser.add_argument("--n-features", type=int, default=ASSESSMENT_PARAMS["n_features"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-compaction-") as directory:
+        model_registry.ARTIFACT_DIR = directory  # Feature rankings are saved there, not in ./artifacts
+        mismatches = compare(args)
+    if mismatches:
+        print(f"{mismatches} compacted model(s) differ from the uncompacted ones", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
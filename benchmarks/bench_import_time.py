@@ -0,0 +1,148 @@
+"""Cold-start import cost of the app, measured with `python -X importtime`.
+
+Every scenario runs its imports in fresh interpreters (best of --repeat runs)
+and reports the wall time of the imports and a breakdown by top-level package
+(self time of all its modules, like the "self" column of -X importtime).
+
+    welcome screen          what the app imports before the welcome screen renders
+    welcome screen (eager)  the same with sklearn imported up front, as before
+    first prediction        what loading and running a model adds (unpickling imports sklearn)
+    matplotlib chart        what CAREER_CHART_BACKEND=matplotlib adds on first render
+
+Importing modules does not show what the page's first script run loads, so a
+last scenario runs app.py's welcome screen with Streamlit's AppTest in a fresh
+interpreter and reports the run's wall time and which thread first imported
+sklearn and scipy: it must not be the script thread (sklearn comes with the
+saved models, which are loaded in the background). Point CAREER_ARTIFACT_DIR
+at trained models so that there is something to load.
+
+Run from the repository root:
+
+    python benchmarks/bench_import_time.py [--repeat 5] [--top 8] [--tree career_model]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules app.py imports at the top, before any page is rendered
+APP_MODULES = [
+    "streamlit", "pandas", "numpy", "data_cache", "career_model", "training_worker",
+    "prediction_cache", "question_bank", "static_assets",
+]
+SCENARIOS = [
+    ("streamlit alone", ["streamlit"]),
+    ("welcome screen", APP_MODULES),
+    ("welcome screen (eager)", APP_MODULES + ["sklearn.tree", "sklearn.model_selection", "sklearn.metrics"]),
+    ("first prediction", APP_MODULES + ["sklearn.tree", "sklearn.model_selection"]),
+    ("matplotlib chart", APP_MODULES + ["matplotlib.pyplot"]),
+]
+
+HEAVY_PACKAGES = ("sklearn", "scipy")
+
+# Runs the welcome screen once and prints {"seconds": ..., "importers": {module: thread}};
+# career_model is only imported by the app script, so its importer is the script thread
+WELCOME_RUN = f"""
+import json, sys, threading, time
+importers = {{}}
+
+class Recorder:
+    def find_spec(self, name, path=None, target=None):
+        if name in {HEAVY_PACKAGES + ("career_model",)!r}:
+            importers.setdefault(name, threading.current_thread().name)
+        return None
+
+sys.meta_path.insert(0, Recorder())
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=300)
+started = time.perf_counter()
+at.run()
+print(json.dumps({{"seconds": time.perf_counter() - started, "importers": importers}}))
+"""
+
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def importtime(modules):
+    """Returns [(self_us, cumulative_us, depth, module), ...] for importing modules in a fresh interpreter"""
+    code = "; ".join(f"import {module}" for module in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((int(self_us), int(cumulative_us), len(indent) // 2, module))
+    return rows
+
+
+def by_package(rows):
+    """Returns {top-level package: total self time in us}"""
+    totals = {}
+    for self_us, _, _, module in rows:
+        package = module.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return totals
+
+
+def best_of(modules, repeat):
+    """Returns (total us, per-package us) of the fastest of repeat runs"""
+    runs = []
+    for _ in range(repeat):
+        rows = importtime(modules)
+        runs.append((sum(self_us for self_us, *_ in rows), by_package(rows)))
+    return min(runs, key=lambda run: run[0])
+
+
+def welcome_run():
+    """Returns the first script run's wall time and the threads that imported the heavy packages"""
+    proc = subprocess.run([sys.executable, "-c", WELCOME_RUN], cwd=ROOT, capture_output=True, text=True, check=True)
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    script_thread = result["importers"].pop("career_model", None)
+    return result["seconds"], {
+        package: f"{thread} (script thread)" if thread == script_thread else thread
+        for package, thread in result["importers"].items()
+    }
+
+
+def print_tree(module, limit):
+    """Prints the slowest imports of a module in -X importtime's own format"""
+    rows = importtime([module])
+    print("import time: self [us] | cumulative | imported package")
+    for self_us, cumulative_us, depth, module in sorted(rows, key=lambda row: -row[1])[:limit]:
+        print(f"import time: {self_us:>9} | {cumulative_us:>10} | {'  ' * depth}{module}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per scenario (best is kept)")
+    parser.add_argument("--top", type=int, default=8, help="Packages listed per scenario")
+    parser.add_argument("--tree", metavar="MODULE", help="Print the slowest imports of one module instead")
+    args = parser.parse_args()
+
+    if args.tree:
+        print_tree(args.tree, args.top)
+        return
+
+    for label, modules in SCENARIOS:
+        total, packages = best_of(modules, args.repeat)
+        print(f"{label:<24}{total / 1000:>9.1f} ms")
+        ranked = sorted(packages.items(), key=lambda item: -item[1])[:args.top]
+        print("    " + "  ".join(f"{package} {us / 1000:.0f}" for package, us in ranked))
+
+    seconds, importers = welcome_run()
+    print(f"{'welcome screen (app run)':<24}{seconds * 1000:>9.1f} ms")
+    print("    " + "  ".join(f"{package} imported by {importers.get(package, 'nobody')}"
+                             for package in HEAVY_PACKAGES))
+
+
+if __name__ == "__main__":
+    main()
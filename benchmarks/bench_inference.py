@@ -0,0 +1,82 @@
+"""Micro-benchmark: compiled tree walk vs model.predict on a one-row DataFrame.
+
+Run from the repository root:
+
+    python benchmarks/bench_inference.py [--repeat 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.tree import DecisionTreeClassifier
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_cache  # noqa: E402
+from tree_inference import CompiledTree  # noqa: E402
+
+
+def encode(df):
+    """Ordinal-encodes every non-numeric column like LabelEncoder (sorted categories)"""
+    encoded = df.copy()
+    for col in encoded.columns:
+        if not pd.api.types.is_numeric_dtype(encoded[col]):
+            encoded[col] = pd.Categorical(encoded[col].astype(str)).codes
+    return encoded
+
+
+def percentiles(samples_s):
+    samples_us = np.asarray(samples_s) * 1e6
+    return {p: float(np.percentile(samples_us, p)) for p in (50, 90, 99)}
+
+
+def time_calls(fn, rows, repeat):
+    samples = []
+    for i in range(repeat):
+        row = rows[i % len(rows)]
+        start = time.perf_counter()
+        fn(row)
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="new_updated_data.xlsx")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    df = encode(data_cache.read_excel_cached(args.data))
+    X = df.drop("Predicted_Career_Field", axis=1)
+    y = df["Predicted_Career_Field"]
+    model = DecisionTreeClassifier(random_state=42).fit(X, y)
+    compiled = CompiledTree(model)
+
+    # Both paths must agree on every row before their speed is compared
+    assert np.array_equal(compiled.predict(X.to_numpy()), model.predict(X))
+
+    columns = list(X.columns)
+    vectors = X.to_numpy().tolist()
+    answer_dicts = X.to_dict(orient="records")
+
+    sklearn_times = time_calls(
+        lambda answers: model.predict(pd.DataFrame([answers], columns=columns))[0],
+        answer_dicts, args.repeat,
+    )
+    compiled_times = time_calls(compiled.predict_one, vectors, args.repeat)
+
+    print(f"tree: depth={model.get_depth()} leaves={compiled.n_leaves} features={len(columns)}")
+    print(f"{'path':<34}{'p50 us':>10}{'p90 us':>10}{'p99 us':>10}")
+    for name, times in (
+        ("model.predict(one-row DataFrame)", sklearn_times),
+        ("CompiledTree.predict_one(vector)", compiled_times),
+    ):
+        print(f"{name:<34}{times[50]:>10.1f}{times[90]:>10.1f}{times[99]:>10.1f}")
+    print(f"speed-up at p50: {sklearn_times[50] / compiled_times[50]:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""Load test: how many concurrent assessment sessions one app server handles.
+
+Starts `streamlit run app.py` on a free local port and drives simulated users
+over Streamlit's websocket protocol, the way a browser does. Each user opens a
+session, goes through one of the app's flows (--flow) and then starts over
+with a new session:
+
+    assessment     loads the welcome screen, clicks Start Assessment, answers the
+                   questionnaire at random and submits it. The assessment model
+                   is trained on Book1.xlsx, which is not part of the
+                   repository: copy it into --cwd first.
+    career_match   loads the page, answers the career match questions at random
+                   and clicks Find My Career Match (one full rerun, not the
+                   fragment reruns of a browser). Uses new_updated_data.xlsx
+                   from the repository.
+
+Every --duration seconds the number of concurrent users steps up through
+--levels, and for each level the report shows:
+
+    latency       rerun latency percentiles (send to script finished), overall and per step
+    reruns/s      completed reruns per second
+    server CPU    CPU time of the server process per second of wall time (100% = one core)
+    server RSS    resident memory of the server at the end of the level (and its peak)
+
+The capacity is the highest level whose p90 latency stays within --slo-ms
+without errors. The client runs on the same machine, so its own CPU use is
+reported too. Results can be saved to JSON and compared between runs:
+
+    python benchmarks/bench_load.py --output before.json
+    python benchmarks/bench_load.py --levels 1,4,16 --compare before.json
+    python benchmarks/bench_load.py --flow career_match
+
+Reads the server's CPU and memory from /proc, so it runs on Linux only. The
+server inherits the environment (CAREER_ARTIFACT_DIR, CAREER_TRACING...) and
+runs in --cwd, where the app reads its spreadsheets.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from career_model import ASSESSMENT_DATA_PATH  # noqa: E402
+
+DEFAULT_LEVELS = "1,2,4,8,16"
+START_LABEL = "Start Assessment"
+PREDICT_LABEL = "Predict My Career"
+RESULT_TEXT = "Your Career Prediction"
+MATCH_LABEL = "Find My Career Match"
+MATCH_RESULT_TEXT = "Your Career Match"
+
+
+class FlowError(Exception):
+    """A session did not reach the next step of the assessment"""
+
+
+# ====================== SERVER ======================
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app, port, cwd, log_file):
+    """Starts the app headless and waits until it answers health checks"""
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, app), "--server.headless", "true",
+         "--server.port", str(port), "--server.address", "127.0.0.1", "--browser.gatherUsageStats", "false"],
+        cwd=cwd, stdout=log_file, stderr=subprocess.STDOUT,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("server did not become healthy within 60 s")
+
+
+class ProcessStats:
+    """CPU time and memory of a process, read from /proc"""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.ticks = os.sysconf("SC_CLK_TCK")
+
+    def cpu_seconds(self):
+        with open(f"/proc/{self.pid}/stat") as stat:
+            fields = stat.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self.ticks  # utime + stime
+
+    def memory_mb(self):
+        """Returns the current and peak resident memory in MB"""
+        values = {}
+        with open(f"/proc/{self.pid}/status") as status:
+            for line in status:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "VmHWM"):
+                    values[key] = int(value.split()[0]) / 1024
+        return values["VmRSS"], values["VmHWM"]
+
+
+# ====================== SIMULATED USER ======================
+class Session:
+    """One browser tab: a websocket session that reruns the script with widget states"""
+
+    def __init__(self, url, rng):
+        self.url = url
+        self.rng = rng
+        self.ws = None
+        self.states = {}  # Widget id -> WidgetState, sent with every rerun like the browser does
+        self.elements = []  # Elements of the last script run
+
+    async def __aenter__(self):
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.ws.close()
+
+    async def rerun(self, trigger=None):
+        """Reruns the script (clicking the trigger button, if given) and returns the latency"""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        if trigger is not None:
+            msg.rerun_script.widget_states.widgets.append(WidgetState(id=trigger, trigger_value=True))
+        started = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            fm = ForwardMsg()
+            fm.ParseFromString(await self.ws.recv())
+            kind = fm.WhichOneof("type")
+            if kind == "new_session":
+                self.elements = []  # A new script run (st.rerun() starts another one)
+            elif kind == "delta" and fm.delta.WhichOneof("type") == "new_element":
+                self.elements.append(fm.delta.new_element)
+            elif kind == "script_finished" and fm.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                return time.perf_counter() - started
+
+    def widgets(self, kind):
+        return [getattr(element, kind) for element in self.elements if element.WhichOneof("type") == kind]
+
+    def button(self, label):
+        return next((button.id for button in self.widgets("button") if label in button.label), None)
+
+    def answer_questions(self):
+        """Picks a random option for every radio and select box on the page"""
+        for kind in ("radio", "selectbox"):
+            for widget in self.widgets(kind):
+                if widget.options:
+                    self.states[widget.id] = WidgetState(id=widget.id, string_value=self.rng.choice(widget.options))
+
+    def shows_result(self, text):
+        return any(text in markdown.body for markdown in self.widgets("markdown"))
+
+
+async def assessment_flow(url, rng, think, record):
+    """Runs one user's assessment in a new session, calling record(step, seconds) per rerun"""
+    async with Session(url, rng) as session:
+        record("welcome", await session.rerun())
+        start = session.button(START_LABEL)
+        if start is None:
+            raise FlowError("no Start Assessment button on the welcome screen")
+        await asyncio.sleep(think * rng.uniform(0.5, 1.5))
+        record("start", await session.rerun(start))
+        submit = session.button(PREDICT_LABEL)
+        if submit is None:
+            raise FlowError(f"no questionnaire after Start Assessment (is the model trained? "
+                            f"it needs {ASSESSMENT_DATA_PATH} in --cwd)")
+        session.answer_questions()
+        await asyncio.sleep(think * rng.uniform(0.5, 1.5))
+        record("predict", await session.rerun(submit))
+        if not session.shows_result(RESULT_TEXT):
+            raise FlowError("no prediction after submitting the questionnaire")
+
+
+async def career_match_flow(url, rng, think, record):
+    """Runs one user's career match in a new session, calling record(step, seconds) per rerun"""
+    async with Session(url, rng) as session:
+        record("welcome", await session.rerun())
+        submit = session.button(MATCH_LABEL)
+        if submit is None:
+            raise FlowError("no Find My Career Match button (is the career match model trained?)")
+        session.answer_questions()
+        await asyncio.sleep(think * rng.uniform(0.5, 1.5))
+        record("predict", await session.rerun(submit))
+        if not session.shows_result(MATCH_RESULT_TEXT):
+            raise FlowError("no career match after clicking Find My Career Match")
+
+
+# Flow name -> (flow, steps it records)
+FLOWS = {
+    "assessment": (assessment_flow, ("welcome", "start", "predict")),
+    "career_match": (career_match_flow, ("welcome", "predict")),
+}
+
+
+async def warm_up(url, flow, timeout):
+    """Runs the flow until it succeeds once, so the model is trained before measuring"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            await FLOWS[flow][0](url, random.Random(0), 0, lambda step, seconds: None)
+            return
+        except FlowError as exc:
+            if time.monotonic() > deadline:
+                raise FlowError(f"warm-up did not complete a {flow} flow within {timeout:.0f} s: {exc}") from exc
+            await asyncio.sleep(1)
+
+
+async def run_level(url, flow, users, duration, think, server, seed):
+    """Keeps `users` sessions busy for `duration` seconds and returns the level's results"""
+    run_flow, steps = FLOWS[flow]
+    latencies = {step: [] for step in steps}
+    counts = {"flows": 0, "errors": 0}
+
+    def record(step, seconds):
+        latencies[step].append(seconds)
+
+    async def user(index):
+        rng = random.Random(seed * 1_000_003 + index)
+        while time.monotonic() < deadline:
+            try:
+                await run_flow(url, rng, think, record)
+                counts["flows"] += 1
+            except (FlowError, OSError, websockets.WebSocketException):
+                counts["errors"] += 1
+
+    cpu_before, client_before = server.cpu_seconds(), time.process_time()
+    started = time.monotonic()
+    deadline = started + duration
+    await asyncio.gather(*(user(index) for index in range(users)))  # Flows in progress finish
+    wall = time.monotonic() - started
+    rss, peak = server.memory_mb()
+
+    everything = [seconds for step in steps for seconds in latencies[step]]
+    return {
+        "users": users,
+        "seconds": wall,
+        "flows": counts["flows"],
+        "errors": counts["errors"],
+        "reruns_per_s": len(everything) / wall,
+        "latency_ms": {step: percentiles(samples) for step, samples in [("all", everything), *latencies.items()]},
+        "server_cpu_pct": 100 * (server.cpu_seconds() - cpu_before) / wall,
+        "server_rss_mb": rss,
+        "server_peak_rss_mb": peak,
+        "client_cpu_pct": 100 * (time.process_time() - client_before) / wall,
+    }
+
+
+def percentiles(samples_s):
+    if not samples_s:
+        return None
+    samples_ms = np.asarray(samples_s) * 1000
+    return {f"p{p}": float(np.percentile(samples_ms, p)) for p in (50, 90, 99)}
+
+
+# ====================== REPORT ======================
+def capacity(levels, slo_ms):
+    """Returns the highest user count whose p90 latency met the SLO without errors (0 if none)"""
+    best = 0
+    for level in levels:
+        latency = level["latency_ms"]["all"]
+        if level["errors"] or latency is None or latency["p90"] > slo_ms:
+            break
+        best = level["users"]
+    return best
+
+
+def environment():
+    import streamlit
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "streamlit": streamlit.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def print_results(results, baseline=None):
+    old_levels = {level["users"]: level for level in (baseline or {}).get("levels", [])}
+    print(f"{'users':>5}{'flows':>7}{'errors':>7}{'reruns/s':>10}"
+          f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'server CPU':>12}{'RSS MB':>8}{'peak MB':>9}{'client CPU':>12}")
+    for level in results["levels"]:
+        latency = level["latency_ms"]["all"] or {"p50": float("nan"), "p90": float("nan"), "p99": float("nan")}
+        old = old_levels.get(level["users"], {}).get("latency_ms", {}).get("all")
+        change = f"  ({latency['p90'] / old['p90']:.2f}x p90)" if old else ""
+        print(f"{level['users']:>5}{level['flows']:>7}{level['errors']:>7}{level['reruns_per_s']:>10.1f}"
+              f"{latency['p50']:>9.0f}{latency['p90']:>9.0f}{latency['p99']:>9.0f}"
+              f"{level['server_cpu_pct']:>11.0f}%{level['server_rss_mb']:>8.0f}{level['server_peak_rss_mb']:>9.0f}"
+              f"{level['client_cpu_pct']:>11.0f}%{change}")
+        steps = "  ".join(f"{step} {latency['p90']:.0f}"
+                          for step, latency in level["latency_ms"].items() if step != "all" and latency)
+        print(f"{'':>5}  p90 by step (ms): {steps}")
+    summary = f"Capacity: {results['capacity']} concurrent users with p90 <= {results['slo_ms']:.0f} ms"
+    if baseline:
+        summary += f" (baseline: {baseline['capacity']})"
+    print(summary)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="app.py", help="Script to serve, relative to the repository root")
+    parser.add_argument("--cwd", default=ROOT, help="Directory the server runs in (where the app finds its data)")
+    parser.add_argument("--flow", choices=FLOWS, default="assessment",
+                        help=f"User flow to simulate (assessment needs {ASSESSMENT_DATA_PATH}, not in the repository)")
+    parser.add_argument("--levels", default=DEFAULT_LEVELS, help="Comma-separated concurrent user counts")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per level")
+    parser.add_argument("--think", type=float, default=1.0, help="Mean seconds a user waits between steps")
+    parser.add_argument("--slo-ms", type=float, default=1000, help="p90 rerun latency a level must stay within")
+    parser.add_argument("--warmup-timeout", type=float, default=300, help="Seconds to wait for the first model")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare against")
+    args = parser.parse_args()
+    if args.flow == "assessment" and not os.path.exists(os.path.join(args.cwd, ASSESSMENT_DATA_PATH)):
+        parser.error(f"the assessment flow trains on {ASSESSMENT_DATA_PATH}, which is not in {args.cwd} "
+                     "(it is not part of the repository); copy it there, pass --cwd, or use --flow career_match")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    port = free_port()
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    results = {"environment": environment(), "app": args.app, "flow": args.flow, "think_s": args.think,
+               "slo_ms": args.slo_ms, "levels": []}
+    with tempfile.TemporaryFile("w+") as log_file:
+        proc = start_server(args.app, port, args.cwd, log_file)
+        try:
+            server = ProcessStats(proc.pid)
+            print("warming up ...", file=sys.stderr)
+            asyncio.run(warm_up(url, args.flow, args.warmup_timeout))
+            for users in (int(level) for level in args.levels.split(",") if level):
+                print(f"running {users} users for {args.duration:.0f}s ...", file=sys.stderr)
+                results["levels"].append(
+                    asyncio.run(run_level(url, args.flow, users, args.duration, args.think, server, args.seed))
+                )
+        except Exception:
+            log_file.seek(0)
+            print(f"server output:\n{log_file.read()[-4000:]}", file=sys.stderr)
+            raise
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    results["capacity"] = capacity(results["levels"], args.slo_ms)
+    print_results(results, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+        print(f"results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
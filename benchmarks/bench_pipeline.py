@@ -0,0 +1,191 @@
+"""End-to-end benchmark: load, preprocess, train, bundle and predict at several dataset sizes.
+
+Runs every stage of the career model pipeline on the bundled spreadsheet and
+on synthetic datasets from synthetic_data.py, each in a fresh process, and
+reports per stage:
+
+    seconds       wall time of the stage (predict: all --predictions single predictions)
+    peak_rss_mb   the process's peak resident memory once the stage is done
+
+plus the latency percentiles of single predictions made the way the app makes
+them (encode the answers, find the leaf, fetch its payload), both on a cache
+miss and on a cache hit. Results can be saved to JSON and compared between runs:
+
+    python benchmarks/bench_pipeline.py --output before.json
+    python benchmarks/bench_pipeline.py --sizes 10000,100000 --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import data_cache  # noqa: E402
+import model_registry  # noqa: E402
+from career_model import ASSESSMENT_PARAMS, bundle_fields, preprocess_data, train_model  # noqa: E402
+from prediction_cache import PredictionCache  # noqa: E402
+from preprocessing import TARGET  # noqa: E402
+from synthetic_data import CAREERS, SyntheticCareerData  # noqa: E402
+
+BUNDLED_DATA = os.path.join(ROOT, "new_updated_data.xlsx")
+DEFAULT_SIZES = "10000,100000,1000000"
+LABEL_NOISE = 0.2  # Share of synthetic rows whose career is drawn at random
+CORRELATION = 0.5  # Probability that a synthetic feature follows the row's career
+
+
+# ====================== SYNTHETIC DATA ======================
+def write_synthetic(rows, directory):
+    """Writes a synthetic dataset as Parquet (the format the app's data cache reads)"""
+    path = os.path.join(directory, f"synthetic-{rows}.parquet")
+    generator = SyntheticCareerData(len(CAREERS), noise=LABEL_NOISE, correlation=CORRELATION)
+    generator.write_parquet(path, rows)
+    return path
+
+
+# ====================== STAGES ======================
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def percentiles(samples_s):
+    samples_us = np.asarray(samples_s) * 1e6
+    return {f"p{p}": float(np.percentile(samples_us, p)) for p in (50, 90, 99)}
+
+
+def time_predictions(bundle, answers, cache):
+    """Times the app's prediction block for each answer dict"""
+    features = bundle.selected_features
+    samples = []
+    for row in answers:
+        start = time.perf_counter()
+        vector = bundle.preprocessor.transform_one(row, features)
+        bundle.leaf_payloads[cache.leaf(bundle, vector)]
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def run_dataset(name, path, predictions, n_features, directory):
+    """Runs every stage on one dataset (in its own process) and returns the results"""
+    stages = {}
+
+    def stage(label, fn):
+        start = time.perf_counter()
+        result = fn()
+        stages[label] = {"seconds": time.perf_counter() - start, "peak_rss_mb": peak_rss_mb()}
+        return result
+
+    if path.endswith(".xlsx"):
+        data_cache.CACHE_DIR = os.path.join(directory, "data-cache")  # Starts empty
+        stage("load_cold", lambda: data_cache.read_excel_cached(path))
+        df = stage("load", lambda: data_cache.read_excel_cached(path))
+    else:
+        df = stage("load", lambda: pd.read_parquet(path))
+
+    # Feature rankings are saved next to the artifacts: keep them out of ./artifacts,
+    # and start empty so "train" includes ranking the features
+    model_registry.ARTIFACT_DIR = os.path.join(directory, f"artifacts-{name}")
+    df_processed, pipeline = stage("preprocess", lambda: preprocess_data(df))
+    X = df_processed.drop(TARGET, axis=1)
+    y = df_processed[TARGET]
+    model, selected_features = stage("train", lambda: train_model(X, y, n_features=n_features))
+    fields = stage("bundle", lambda: bundle_fields(model, selected_features, pipeline))
+    bundle = model_registry.ModelBundle(version=name, **fields)
+
+    answers = df.drop(columns=TARGET).sample(predictions, replace=True, random_state=0).to_dict("records")
+    # max_entries=0 keeps nothing, so every lookup walks the tree
+    miss = stage("predict", lambda: time_predictions(bundle, answers, PredictionCache(name, None, 0)))
+    warm = PredictionCache(name, path=None, max_entries=len(answers))
+    time_predictions(bundle, answers, warm)
+    hit = time_predictions(bundle, answers, warm)
+
+    return {
+        "rows": len(df),
+        "stages": stages,
+        "predict_latency_us": {"miss": miss, "hit": hit},
+        "model": {"depth": int(model.get_depth()), "leaves": int(model.get_n_leaves()),
+                  "features": len(selected_features)},
+    }
+
+
+# ====================== REPORT ======================
+def environment():
+    import sklearn
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def print_results(results, baseline=None):
+    baseline = (baseline or {}).get("datasets", {})
+    print(f"{'dataset':<18}{'stage':<12}{'seconds':>10}{'peak RSS MB':>13}{'vs baseline':>13}")
+    for name, result in results["datasets"].items():
+        for label, timing in result["stages"].items():
+            old = baseline.get(name, {}).get("stages", {}).get(label, {}).get("seconds")
+            change = f"{timing['seconds'] / old:>12.2f}x" if old else ""
+            print(f"{name:<18}{label:<12}{timing['seconds']:>10.3f}{timing['peak_rss_mb']:>13.0f}{change:>13}")
+        for kind, latency in result["predict_latency_us"].items():
+            old = baseline.get(name, {}).get("predict_latency_us", {}).get(kind, {}).get("p50")
+            change = f"  ({latency['p50'] / old:.2f}x)" if old else ""
+            print(f"{name:<18}{'predict ' + kind:<12}"
+                  f"  p50 {latency['p50']:.1f} / p90 {latency['p90']:.1f} / p99 {latency['p99']:.1f} us{change}")
+        model = result["model"]
+        print(f"{name:<18}{'model':<12}  depth {model['depth']}, {model['leaves']} leaves, "
+              f"{model['features']} features")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated synthetic row counts (empty for none)")
+    parser.add_argument("--no-bundled", action="store_true", help="Skip the bundled spreadsheet")
+    parser.add_argument("--predictions", type=int, default=2000, help="Single predictions timed per dataset")
+    parser.add_argument("--n-features", type=int, default=ASSESSMENT_PARAMS["n_features"])
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    results = {"environment": environment(), "datasets": {}}
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    # One fresh process per task, so each dataset's peak RSS is its own
+    with tempfile.TemporaryDirectory(prefix="bench-pipeline-") as directory, \
+            ProcessPoolExecutor(1, mp_context=get_context("spawn"), max_tasks_per_child=1) as pool:
+        datasets = [] if args.no_bundled else [("bundled", BUNDLED_DATA)]
+        datasets += [(f"synthetic-{size}", pool.submit(write_synthetic, size, directory).result()) for size in sizes]
+        for name, path in datasets:
+            print(f"running {name} ...", file=sys.stderr)
+            results["datasets"][name] = pool.submit(
+                run_dataset, name, path, args.predictions, args.n_features, directory
+            ).result()
+
+    print_results(results, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+        print(f"results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
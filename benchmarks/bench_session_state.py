@@ -0,0 +1,85 @@
+"""Per-session memory of the questionnaire state: question dicts vs shared objects vs IDs.
+
+Simulates many sessions picking their questions the way each version of the
+apps did, and reports the memory retained per session (tracemalloc) and the
+size of the state when serialized (pickle).
+
+Run from the repository root:
+
+    python benchmarks/bench_session_state.py [--sessions 2000]
+"""
+import argparse
+import json
+import os
+import pickle
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import question_bank  # noqa: E402
+
+
+def literal_records(name):
+    """Question dicts as the old in-code literals built them, fresh on every script run"""
+    with open(question_bank.QUESTIONS_PATH, encoding="utf-8") as data_file:
+        records = json.load(data_file)[name]
+    return [
+        {"question": r["question"], "feature": r["feature"],
+         "options": [{"text": label, "value": value} for label, value in r["options"]]}
+        for r in records
+    ]
+
+
+def assessment_state(strategy, bank, rng):
+    """selected_questions of the first app: one question per feature"""
+    if strategy == "dicts":
+        records = literal_records("assessment")
+        return {f: rng.choice([r for r in records if r["feature"] == f]) for f in bank.features}
+    if strategy == "objects":
+        return {f: bank[bank.random_id(f, rng)] for f in bank.features}
+    return {f: bank.random_id(f, rng) for f in bank.features}
+
+
+def career_state(strategy, bank, rng):
+    """questions of the second app: 10 questions covering every feature"""
+    if strategy == "dicts":
+        records = literal_records("career_match")
+        return [records[qid] for qid in bank.sample_ids(10, rng=rng)]
+    if strategy == "objects":
+        return [bank[qid] for qid in bank.sample_ids(10, rng=rng)]
+    return tuple(bank.sample_ids(10, rng=rng))
+
+
+def measure(make_state, sessions):
+    rng = random.Random(0)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    states = [make_state(rng) for _ in range(sessions)]
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    pickled = sum(len(pickle.dumps(state)) for state in states) / sessions
+    return retained / sessions, pickled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=2000)
+    args = parser.parse_args()
+
+    banks = {
+        "assessment": (question_bank.load_bank("assessment"), assessment_state),
+        "career_match": (question_bank.load_bank("career_match"), career_state),
+    }
+    print(f"{'bank':<14}{'session state':<26}{'retained B/session':>20}{'pickled B/session':>19}")
+    for name, (bank, state_fn) in banks.items():
+        for strategy, label in (("dicts", "question dicts (before)"),
+                                ("objects", "shared Question objects"),
+                                ("ids", "question IDs (now)")):
+            retained, pickled = measure(lambda rng: state_fn(strategy, bank, rng), args.sessions)
+            print(f"{name:<14}{label:<26}{retained:>20,.0f}{pickled:>19,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import contextlib
+import glob
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from numbers import Integral
+
+import numpy as np
+
+import model_registry
+from atomic_files import write_atomic
+from leaf_payloads import build_leaf_payloads
+from preprocessing import OrdinalPipeline
+
+# -----------------------------
+# Career assessment model: preprocessing and training.
+# Kept free of Streamlit so the batch scorer and other tools can share it
+# with the app. sklearn (and scipy with it) takes over a second to import, so
+# it is imported by the functions that train, not when the app starts.
+# -----------------------------
+ASSESSMENT_DATA_PATH = "Book1.xlsx"
+ASSESSMENT_SHEET = "Sheet1"
+ASSESSMENT_MODEL = "assessment"  # Model registry name
+ASSESSMENT_PARAMS = {"n_features": 30}  # Keep the top 30 features (default, see assessment_params)
+CAREER_MATCH_MODEL = "career_match"  # Registry name of the career match app's model
+CAREER_MATCH_PARAMS = {"criterion": "entropy", "max_depth": 5}
+COMPACT_MAX_UNIQUE = 0.9  # Fit on deduplicated rows once at least 10% of them are duplicates
+
+def assessment_params():
+    # Training parameters of the served assessment model: the defaults, overridden
+    # by the best configuration model_search recorded next to the artifacts
+    return {**ASSESSMENT_PARAMS, **model_registry.tuned_params(ASSESSMENT_MODEL)}
+
+# -----------------------------
+# Enhanced Preprocessing
+# -----------------------------
+def preprocess_data(df):
+    # One pipeline holds the ordinal mapping of every categorical column and the target
+    pipeline = OrdinalPipeline().fit(df)
+    return pipeline.encode_frame(df), pipeline
+
+# -----------------------------
+# Training Row Compaction
+# -----------------------------
+def compact_rows(X, y):
+    # Encoded answers repeat a lot: identical (X, y) rows become one row weighted
+    # by its count. Trees only see weighted class counts when choosing splits and
+    # filling leaves, so the weighted fit builds the same tree on fewer rows.
+    codes = X.groupby([*X.columns, y], sort=False, dropna=False).ngroup().to_numpy()
+    first = np.unique(codes, return_index=True)[1]  # First row of each group, by group number
+    sample_weight = np.bincount(codes).astype(np.float64)
+    return X.iloc[first], y.iloc[first], sample_weight
+
+def can_compact(tree_params):
+    # Sample counts (unlike weights) shrink with compaction, so the tree only stays
+    # the same with the default count limits and without count-based class weights
+    def is_int(name, default):
+        value = tree_params.get(name, default)
+        return isinstance(value, Integral) and value == default
+    return (is_int("min_samples_leaf", 1) and is_int("min_samples_split", 2)
+            and tree_params.get("class_weight") != "balanced")
+
+def fit_compacted(clf, X, y, compact=True):
+    # Fits on the compacted rows when the tree's settings allow it and enough
+    # rows repeat; with (nearly) all rows unique the weighted fit is no faster
+    if compact and can_compact(clf.get_params()):
+        X_unique, y_unique, sample_weight = compact_rows(X, y)
+        if len(sample_weight) <= COMPACT_MAX_UNIQUE * len(X):
+            return clf.fit(X_unique, y_unique, sample_weight=sample_weight)
+    return clf.fit(X, y)
+
+# -----------------------------
+# Feature Importance Ranking (one fit per dataset version)
+# -----------------------------
+# Rankings are saved next to the model artifacts, so a new process (e.g. a
+# deployment with another N) reuses them, and the most recent ones are kept in
+# memory, keyed by dataset fingerprint. Both are bounded: the files least
+# recently used are deleted like the LRU's oldest entries.
+RANKING_CACHE_SIZE = 8
+RANKING_FILES_KEEP = 32
+_feature_rankings = OrderedDict()
+_rankings_lock = threading.Lock()
+
+def feature_ranking(X, y):
+    # Feature positions from most to least important, in SelectFromModel's order
+    key = (model_registry.dataset_fingerprint(X), model_registry.dataset_fingerprint(y.to_frame()))
+    with _rankings_lock:
+        ranking = _feature_rankings.get(key)
+        if ranking is not None:
+            _feature_rankings.move_to_end(key)
+            return ranking
+    path = ranking_path(key)
+    ranking = _load_ranking(path, X.shape[1])
+    if ranking is None:
+        ranking = fit_ranking(X, y)
+        _save_ranking(path, ranking)
+    ranking.flags.writeable = False  # Shared between callers
+    with _rankings_lock:
+        _feature_rankings[key] = ranking
+        while len(_feature_rankings) > RANKING_CACHE_SIZE:
+            _feature_rankings.popitem(last=False)
+    return ranking
+
+def fit_ranking(X, y):
+    # The ranking itself, without any caching (e.g. for cross-validation folds,
+    # which are never trained on again)
+    from sklearn.tree import DecisionTreeClassifier
+    clf = fit_compacted(DecisionTreeClassifier(random_state=42), X, y)
+    return np.argsort(-clf.feature_importances_, kind="mergesort")
+
+def ranking_path(key):
+    # One file per (features, target) fingerprint pair
+    digest = hashlib.sha256("/".join(key).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(model_registry.ARTIFACT_DIR, f"feature-ranking-{digest}.npy")
+
+def _load_ranking(path, n_features):
+    try:
+        ranking = np.load(path)
+    except (OSError, ValueError):
+        return None
+    # Anything but a permutation of the columns is a stale or damaged file
+    if ranking.shape != (n_features,) or not np.array_equal(np.sort(ranking), np.arange(n_features)):
+        return None
+    with contextlib.suppress(OSError):
+        os.utime(path)  # Marks it recently used, so pruning keeps it
+    return ranking
+
+def _save_ranking(path, ranking):
+    # Best effort: a read-only artifact directory only costs the next process a refit
+    def write(tmp_path):
+        with open(tmp_path, "wb") as tmp_file:  # np.save would append .npy to the path
+            np.save(tmp_file, ranking)
+    try:
+        write_atomic(path, write)
+        _prune_rankings()
+    except OSError:
+        pass
+
+def _prune_rankings():
+    # Keeps the RANKING_FILES_KEEP most recently used files; other processes
+    # may be pruning at the same time, so vanished files are fine
+    mtimes = {}
+    for path in glob.glob(os.path.join(model_registry.ARTIFACT_DIR, "feature-ranking-*.npy")):
+        with contextlib.suppress(OSError):
+            mtimes[path] = os.path.getmtime(path)
+    for path in sorted(mtimes, key=mtimes.get, reverse=True)[RANKING_FILES_KEEP:]:
+        with contextlib.suppress(OSError):
+            os.unlink(path)
+
+def top_features(ranking, n_features):
+    # Top N is a slice of the ranking; columns keep their original order
+    return np.sort(ranking if n_features is None else ranking[:n_features])
+
+# -----------------------------
+# Train Model with Feature Selection
+# -----------------------------
+def train_model(X, y, n_features=10, compact=True, **tree_params):
+    from sklearn.model_selection import train_test_split
+    from sklearn.tree import DecisionTreeClassifier
+
+    # tree_params (max_depth, criterion, min_samples_leaf, ...) apply to the final model;
+    # compact=False fits on every training row instead of the deduplicated ones
+    # Select top N features from the cached importance ranking
+    selected_features = X.columns[top_features(feature_ranking(X, y), n_features)]
+    
+    # Train with selected features
+    X_reduced = X[selected_features]
+    X_train, X_test, y_train, y_test = train_test_split(
+        X_reduced, y, test_size=0.2, random_state=42
+    )
+    # Compacted after the split, so the model learns from exactly the same rows
+    clf = fit_compacted(DecisionTreeClassifier(random_state=42, **tree_params), X_train, y_train, compact)
+    
+    return clf, selected_features
+
+# -----------------------------
+# Fit Model Bundle (stored in the model registry)
+# -----------------------------
+def fit_model_bundle(df, n_features=10, **tree_params):
+    df_processed, pipeline = preprocess_data(df)
+
+    # Prepare features and target
+    X = df_processed.drop("Predicted_Career_Field", axis=1)
+    y = df_processed["Predicted_Career_Field"]
+
+    model, selected_features = train_model(X, y, n_features=n_features, **tree_params)
+    return bundle_fields(model, selected_features, pipeline)
+
+def bundle_fields(model, selected_features, pipeline, **metadata):
+    # Registry fields of a fitted model; everything shown after a prediction is
+    # prebuilt here, per leaf and per model
+    return {
+        "model": model,
+        "selected_features": list(selected_features),
+        "preprocessor": pipeline,
+        "leaf_payloads": build_leaf_payloads(model, list(selected_features), pipeline),
+        "metadata": {"feature_importances": ranked_importances(model, selected_features), **metadata},
+    }
+
+def ranked_importances(model, features):
+    # (feature, importance) pairs with importance > 0, most important first
+    order = np.argsort(-model.feature_importances_, kind="stable")
+    return tuple(
+        (str(features[i]), float(model.feature_importances_[i]))
+        for i in order if model.feature_importances_[i] > 0
+    )
+
+
+def top_careers(proba, bundle, top_k):
+    """Returns (careers, probabilities), each of shape (rows, k), best match first.
+
+    Like the leaf payloads, careers with probability 0 are left out: when a row
+    has fewer than k possible careers, its remaining ranks are None / NaN.
+    """
+    career_names = bundle.preprocessor.decode(bundle.tree.classes)
+    k = min(top_k, proba.shape[1])
+    top = np.argpartition(-proba, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(proba, top, axis=1), axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    probabilities = np.take_along_axis(proba, top, axis=1)
+    possible = probabilities > 0
+    return np.where(possible, career_names[top], None), np.where(possible, probabilities, np.nan)
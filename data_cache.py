@@ -0,0 +1,123 @@
+import hashlib  # For content hashes of the source spreadsheets
+import json  # For the cache manifests
+import os  # For file metadata
+
+import pandas as pd  # For reading spreadsheets and columnar files
+
+from atomic_files import write_atomic  # For publishing cache files atomically
+
+# ====================== COLUMNAR DATA CACHE ======================
+# Parsing .xlsx files with openpyxl is slow, so every sheet is converted once to
+# a columnar binary file (Parquet when pyarrow is installed, pickle otherwise).
+# A small JSON manifest per source file and sheet records the file's mtime, size
+# and SHA-256: an unchanged mtime/size skips hashing entirely, and a changed
+# hash rebuilds the cache. Manifests are named after a hash of the absolute
+# path, so spreadsheets with the same name in different directories never
+# share a cache entry.
+
+# Directory holding the converted sheets and their manifests
+CACHE_DIR = os.environ.get("CAREER_DATA_CACHE_DIR", os.path.join(".cache", "data"))
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_sha256(path):
+    """Returns the SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _manifest_path(path, sheet_name):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    path_hash = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"{stem}-{path_hash}-{sheet_name}.json")
+
+
+def _read_manifest(manifest_path, path):
+    """Returns the manifest of path, or None if there is none (or it belongs to another file)"""
+    try:
+        with open(manifest_path, encoding="utf-8") as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("source") != os.path.abspath(path):
+        return None
+    return manifest
+
+
+def _write_json(path, payload):
+    with open(path, "w", encoding="utf-8") as out_file:
+        json.dump(payload, out_file, indent=2)
+
+
+def _write_columnar(df, base_path):
+    """Writes df as Parquet, falling back to pickle; returns the file written"""
+    try:
+        import pyarrow  # noqa: F401  (optional dependency)
+        target = base_path + ".parquet"
+        write_atomic(target, lambda tmp: df.to_parquet(tmp, index=False))
+    except (ImportError, ValueError, TypeError):
+        # pyarrow missing, or a column with mixed types it cannot store
+        target = base_path + ".pkl"
+        write_atomic(target, df.to_pickle)
+    return target
+
+
+def _read_columnar(cache_file):
+    if cache_file.endswith(".parquet"):
+        return pd.read_parquet(cache_file)
+    return pd.read_pickle(cache_file)
+
+
+def source_digest(path, sheet_name=0):
+    """Returns the SHA-256 of a cached spreadsheet, hashing only if it changed on disk"""
+    stat = os.stat(path)
+    manifest = _read_manifest(_manifest_path(path, sheet_name), path)
+    if manifest and manifest["mtime_ns"] == stat.st_mtime_ns and manifest["size"] == stat.st_size:
+        return manifest["sha256"]
+    return file_sha256(path)
+
+
+def read_excel_cached(path, sheet_name=0):
+    """Reads an Excel sheet through the columnar cache, converting it on first use.
+
+    Raises FileNotFoundError like pd.read_excel when the spreadsheet is missing.
+    """
+    stat = os.stat(path)
+    manifest_path = _manifest_path(path, sheet_name)
+    manifest = _read_manifest(manifest_path, path)
+
+    # Fast path: the spreadsheet has not been touched since it was converted
+    if (
+        manifest
+        and manifest["mtime_ns"] == stat.st_mtime_ns
+        and manifest["size"] == stat.st_size
+        and os.path.exists(manifest["cache_file"])
+    ):
+        return _read_columnar(manifest["cache_file"])
+
+    digest = file_sha256(path)
+    if manifest and manifest["sha256"] == digest and os.path.exists(manifest["cache_file"]):
+        # Touched but identical content: keep the cache, refresh the manifest
+        cache_file = manifest["cache_file"]
+        df = _read_columnar(cache_file)
+    else:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        df = pd.read_excel(path, sheet_name=sheet_name)
+        base_path = os.path.splitext(manifest_path)[0] + f"-{digest[:16]}"
+        cache_file = _write_columnar(df, base_path)
+        if manifest and manifest["cache_file"] != cache_file and os.path.exists(manifest["cache_file"]):
+            os.unlink(manifest["cache_file"])  # Drop the conversion of the old contents
+
+    new_manifest = {
+        "source": os.path.abspath(path),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": digest,
+        "cache_file": cache_file,
+    }
+    write_atomic(manifest_path, lambda tmp: _write_json(tmp, new_manifest))
+    return df
@@ -0,0 +1,83 @@
+import numpy as np  # For ranking class distributions
+
+from tree_inference import TREE_LEAF, CompiledTree
+
+# ====================== LEAF PAYLOADS ======================
+# A decision tree has a finite number of leaves, and everything shown after a
+# prediction that depends only on the leaf (career, class distribution,
+# decision path, career texts) is built here once at training time. Serving
+# then finds the leaf index and fetches its prebuilt payload.
+
+DEFAULT_TOP_K = 3  # Careers kept in each leaf's distribution
+
+
+def decision_paths(tree):
+    """Yields (leaf, [(node, went_left), ...]) for every leaf of a CompiledTree"""
+    stack = [(0, [])]
+    while stack:
+        node, path = stack.pop()
+        if tree.left[node] == TREE_LEAF:
+            yield node, path
+        else:
+            stack.append((tree.right[node], path + [(node, False)]))
+            stack.append((tree.left[node], path + [(node, True)]))
+
+
+def describe_path(tree, path, features, preprocessor):
+    """Returns one readable condition per feature tested on a decision path"""
+    # Narrow each feature to the interval (low, high] allowed by the path
+    bounds = {}
+    for node, went_left in path:
+        low, high = bounds.get(tree.feature[node], (-np.inf, np.inf))
+        threshold = tree.threshold[node]
+        bounds[tree.feature[node]] = (low, min(high, threshold)) if went_left else (max(low, threshold), high)
+
+    conditions = []
+    for index, (low, high) in bounds.items():
+        feature = features[index]
+        name = feature.replace("_", " ")
+        if feature in preprocessor.categories:
+            categories = preprocessor.categories[feature]
+            codes = np.arange(len(categories), dtype=np.float32)
+            allowed = categories[(codes > low) & (codes <= high)]
+            conditions.append(f"{name} is {_join_or(allowed)}")
+        elif low == -np.inf:
+            conditions.append(f"{name} ≤ {high:g}")
+        elif high == np.inf:
+            conditions.append(f"{name} > {low:g}")
+        else:
+            conditions.append(f"{low:g} < {name} ≤ {high:g}")
+    return conditions
+
+
+def build_leaf_payloads(model, features, preprocessor, top_k=DEFAULT_TOP_K, describe_career=None):
+    """Returns {leaf index: payload} for a fitted tree.
+
+    Each payload holds the career, its top_k class distribution as (career,
+    probability) pairs and the decision path. describe_career(career), if
+    given, returns a dict of extra per-career entries merged into the payload.
+    """
+    tree = CompiledTree(model)
+    career_names = preprocessor.decode(tree.classes)
+    career_texts = {}
+    payloads = {}
+    for leaf, path in decision_paths(tree):
+        proba = tree.proba_array[leaf]
+        ranked = [i for i in np.argsort(-proba, kind="stable")[:top_k] if proba[i] > 0]
+        career = str(preprocessor.decode([tree.leaf_class[leaf]])[0])
+        payload = {
+            "career": career,
+            "distribution": tuple((str(career_names[i]), float(proba[i])) for i in ranked),
+            "path": tuple(describe_path(tree, path, features, preprocessor)),
+        }
+        if describe_career is not None:
+            if career not in career_texts:
+                career_texts[career] = describe_career(career)
+            payload.update(career_texts[career])
+        payloads[leaf] = payload
+    return payloads
+
+
+def _join_or(values):
+    values = [str(value) for value in values]
+    return values[0] if len(values) == 1 else f"{', '.join(values[:-1])} or {values[-1]}"
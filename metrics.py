@@ -0,0 +1,277 @@
+import logging  # For reporting an exporter that cannot start
+import os  # For the exporter settings
+import threading  # For the exporter threads and the aggregation lock
+import time  # For the export interval
+import weakref  # For tracking publishers and caches without keeping them alive
+from bisect import bisect_left  # For finding histogram buckets
+from collections import deque  # For the lock-free event queue
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # For the /metrics endpoint
+from pathlib import Path  # For writing the metrics file
+
+from atomic_files import write_atomic  # Scrapers never read a partial file
+
+# ====================== METRICS ======================
+# Counters and histograms in the Prometheus text format, exposed on a local
+# /metrics endpoint (CAREER_METRICS_PORT) and/or rewritten periodically to a
+# file for node_exporter's textfile collector (CAREER_METRICS_FILE). Nothing is
+# recorded unless one of them is set.
+#
+# Recording never takes a lock: it appends one event to a deque (an atomic
+# operation), and a background thread drains the queue into the totals, which
+# only the exporters read. Values that already live elsewhere (the active
+# model version, prediction cache counters) are read when metrics are exported.
+
+METRICS_PORT = os.environ.get("CAREER_METRICS_PORT")
+METRICS_FILE = os.environ.get("CAREER_METRICS_FILE")
+METRICS_ADDR = os.environ.get("CAREER_METRICS_ADDR", "127.0.0.1")
+ENABLED = bool(METRICS_PORT or METRICS_FILE)
+
+EXPORT_INTERVAL = 5.0  # Seconds between drains and file rewrites
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+TRAINING_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+logger = logging.getLogger(__name__)
+
+_events = deque()  # (metric, label values, value) recorded since the last drain
+_totals_lock = threading.Lock()  # Guards the totals; taken by the drainer and exporters only
+_metrics = []
+_publishers = weakref.WeakSet()
+_caches = weakref.WeakSet()
+
+
+class Counter:
+    """Monotonic total per label set"""
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._totals = {}
+        _metrics.append(self)
+
+    def inc(self, *labels, amount=1):
+        if ENABLED:
+            _events.append((self, labels, amount))
+
+    def _apply(self, labels, amount):
+        self._totals[labels] = self._totals.get(labels, 0) + amount
+
+    def _samples(self):
+        for labels, total in self._totals.items():
+            yield self.name, self.labelnames, labels, total
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets, per label set"""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._totals = {}  # labels -> [per-bucket counts..., +Inf count, sum]
+        _metrics.append(self)
+
+    def observe(self, value, *labels):
+        if ENABLED:
+            _events.append((self, labels, value))
+
+    def _apply(self, labels, value):
+        totals = self._totals.get(labels)
+        if totals is None:
+            totals = self._totals[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        totals[bisect_left(self.buckets, value)] += 1
+        totals[-1] += value
+
+    def _samples(self):
+        names = self.labelnames + ("le",)
+        for labels, totals in self._totals.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), totals):
+                cumulative += count
+                yield f"{self.name}_bucket", names, labels + (_format_value(bound),), cumulative
+            yield f"{self.name}_sum", self.labelnames, labels, totals[-1]
+            yield f"{self.name}_count", self.labelnames, labels, cumulative
+
+
+class Gauge:
+    """Values computed when metrics are exported, from a function returning {label values: value}"""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labelnames, collect, kind="gauge"):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.kind = kind
+        self._collect = collect
+        _metrics.append(self)
+
+    def _samples(self):
+        for labels, value in self._collect().items():
+            yield self.name, self.labelnames, labels, value
+
+
+# ====================== APP METRICS ======================
+PREDICTIONS = Counter("career_predictions_total", "Predictions served", ["model"])
+PREDICTION_LATENCY = Histogram(
+    "career_prediction_latency_seconds", "Time to encode the answers and find the prediction", ["model"],
+)
+TRAINING_DURATION = Histogram(
+    "career_training_duration_seconds", "Time from a data change to the new model being published "
+    "(training, or loading its saved artifact)", ["model"], TRAINING_BUCKETS,
+)
+ROWS_LOADED = Counter("career_dataset_rows_loaded_total", "Dataset rows loaded from disk", ["dataset"])
+
+
+def observe_prediction(model, seconds):
+    """Counts one prediction and its latency"""
+    PREDICTIONS.inc(model)
+    PREDICTION_LATENCY.observe(seconds, model)
+
+
+def track_publisher(publisher):
+    """Exports the version of the model a ModelPublisher serves"""
+    _publishers.add(publisher)
+
+
+def track_prediction_cache(cache):
+    """Exports the lookup counters of a PredictionCache"""
+    _caches.add(cache)
+
+
+def _model_versions():
+    versions = {}
+    for publisher in list(_publishers):
+        bundle = publisher.bundle  # Read once: training may publish a new one meanwhile
+        if bundle is not None:
+            versions[publisher.name, bundle.version] = 1
+    return versions
+
+
+def _cache_lookups():
+    lookups = {}
+    for cache in list(_caches):
+        stats = cache.stats()
+        for result, counter in (("hit", "hits"), ("disk_hit", "disk_hits"), ("miss", "misses")):
+            lookups[cache.name, result] = lookups.get((cache.name, result), 0) + stats[counter]
+    return lookups
+
+
+def _cache_hit_ratio():
+    lookups = _cache_lookups()
+    ratios = {}
+    for model in {model for model, _ in lookups}:
+        total = sum(lookups[model, result] for result in ("hit", "disk_hit", "miss"))
+        ratios[(model,)] = (lookups[model, "hit"] + lookups[model, "disk_hit"]) / total if total else 0.0
+    return ratios
+
+
+Gauge("career_model_info", "Version of the model currently served", ["model", "version"], _model_versions)
+Gauge("career_prediction_cache_lookups_total", "Prediction cache lookups of this process by result",
+      ["model", "result"], _cache_lookups, kind="counter")
+Gauge("career_prediction_cache_hit_ratio", "Share of prediction cache lookups served without walking the tree",
+      ["model"], _cache_hit_ratio)
+
+
+# ====================== EXPORT ======================
+def drain():
+    """Moves the recorded events into the totals"""
+    with _totals_lock:
+        while True:
+            try:
+                metric, labels, value = _events.popleft()
+            except IndexError:
+                return
+            metric._apply(labels, value)
+
+
+def render():
+    """Returns every metric in the Prometheus text exposition format"""
+    drain()
+    lines = []
+    with _totals_lock:
+        for metric in _metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labelnames, labels, value in metric._samples():
+                pairs = ",".join(f'{key}="{_escape(label)}"' for key, label in zip(labelnames, labels))
+                lines.append(f"{name}{{{pairs}}} {_format_value(value)}" if pairs else f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_file(path):
+    """Atomically rewrites path with the current metrics"""
+    text = render()
+    write_atomic(path, lambda tmp_path: Path(tmp_path).write_text(text, encoding="utf-8"))
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # One line per scrape would flood the app's output
+
+
+def serve(port, addr=METRICS_ADDR):
+    """Serves /metrics on a daemon thread; returns the server"""
+    server = ThreadingHTTPServer((addr, int(port)), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def _export_loop(path, interval):
+    while True:
+        time.sleep(interval)
+        if path:
+            try:
+                write_file(path)
+            except OSError:
+                pass  # Best effort: the next interval tries again
+        else:
+            drain()  # Keeps the queue short between scrapes
+
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def start_exporters(port=METRICS_PORT, path=METRICS_FILE, interval=EXPORT_INTERVAL):
+    """Starts the configured exporters once per process; returns True if metrics are exported"""
+    global _started
+    if not (port or path):
+        return False
+    with _start_lock:
+        if not _started:
+            if port:
+                try:
+                    serve(port)
+                except OSError:
+                    # Another app process already serves this port; the file exporter still runs
+                    logger.warning("Metrics port %s unavailable; not serving /metrics", port, exc_info=True)
+            threading.Thread(target=_export_loop, args=(path, interval), name="metrics-export", daemon=True).start()
+            _started = True
+    return True
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    if isinstance(value, str):
+        return value
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
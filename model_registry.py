@@ -0,0 +1,177 @@
+import glob  # For finding the artifacts of a model
+import hashlib  # For dataset and parameter fingerprints
+import json  # For canonical parameter serialization
+import os  # For artifact paths
+import threading  # For guarding the per-process artifact cache
+import weakref  # For dropping bundles nothing serves any more
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from pathlib import Path  # For writing the recorded parameters
+from types import MappingProxyType  # For read-only views of the bundle's mappings
+
+import joblib  # For (de)serializing fitted estimators
+import pandas as pd  # For hashing DataFrames
+
+from atomic_files import write_atomic  # For publishing artifacts atomically
+from tree_inference import CompiledTree
+
+# ====================== MODEL REGISTRY ======================
+# Fitted models are stored on disk as versioned artifacts. The version is a hash
+# of the training data, the training parameters and ARTIFACT_FORMAT, so any
+# change to one of them produces a new artifact instead of reusing a stale one.
+
+# Directory holding the serialized model bundles
+ARTIFACT_DIR = os.environ.get("CAREER_ARTIFACT_DIR", "artifacts")
+
+# Bump whenever the layout of ModelBundle changes so old artifacts are ignored
+ARTIFACT_FORMAT = 3
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """A fitted model together with the pipeline that encodes its inputs"""
+    version: str
+    model: object
+    selected_features: list
+    preprocessor: object  # Fitted preprocessing.OrdinalPipeline
+    metadata: dict = field(default_factory=dict)
+    leaf_payloads: dict = field(default_factory=dict)  # Leaf index -> prebuilt prediction payload
+
+    @cached_property
+    def tree(self):
+        """The model compiled for fast single-row prediction (built on first use)"""
+        return CompiledTree(self.model)
+
+
+# Bundles already deserialized in this process, keyed by (name, version). Only
+# weakly held: a bundle stays while a publisher serves it or a session pins it,
+# and is reloaded from disk if it is needed again after that.
+_loaded_bundles = weakref.WeakValueDictionary()
+# One lock per artifact, so loading or training one never blocks the others
+_artifact_locks = {}
+_registry_lock = threading.Lock()
+
+
+def dataset_fingerprint(df):
+    """Returns a stable hash of a DataFrame's columns, dtypes and values"""
+    digest = hashlib.sha256()
+    schema = [[str(col) for col in df.columns], [str(dtype) for dtype in df.dtypes]]
+    digest.update(json.dumps(schema).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def artifact_version(df, params):
+    """Returns the artifact version for a dataset and a set of training parameters"""
+    digest = hashlib.sha256()
+    digest.update(dataset_fingerprint(df).encode("utf-8"))
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(str(ARTIFACT_FORMAT).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def artifact_path(name, version):
+    """Returns the on-disk location of an artifact"""
+    return os.path.join(ARTIFACT_DIR, f"{name}-{version}.joblib")
+
+
+def save_bundle(name, bundle):
+    """Writes a bundle atomically so readers never see a partial artifact"""
+    write_atomic(artifact_path(name, bundle.version), lambda tmp_path: joblib.dump(bundle, tmp_path))
+
+
+def tuned_params_path(name):
+    """Returns the location of the training parameters recorded for a model"""
+    return os.path.join(ARTIFACT_DIR, f"{name}-params.json")
+
+
+def save_tuned_params(name, params, **details):
+    """Records the parameters a model is trained with from now on (e.g. found by model_search)"""
+    text = json.dumps({"params": params, **details}, indent=2, default=str)
+    write_atomic(tuned_params_path(name), lambda tmp_path: Path(tmp_path).write_text(text, encoding="utf-8"))
+
+
+def tuned_params(name):
+    """Returns the parameters recorded by save_tuned_params, or {} if there are none"""
+    try:
+        with open(tuned_params_path(name), encoding="utf-8") as params_file:
+            return dict(json.load(params_file)["params"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def load_bundle(name, version):
+    """Loads a bundle from disk, or returns None if it has not been trained yet"""
+    path = artifact_path(name, version)
+    if not os.path.exists(path):
+        return None
+    bundle = joblib.load(path)
+    if not isinstance(bundle, ModelBundle) or bundle.version != version:
+        return None
+    return bundle
+
+
+def read_only(bundle):
+    """Returns a copy of the bundle whose containers cannot be mutated by callers"""
+    return replace(
+        bundle,
+        selected_features=tuple(bundle.selected_features),
+        metadata=MappingProxyType(dict(bundle.metadata)),
+        leaf_payloads=MappingProxyType(dict(bundle.leaf_payloads)),
+    )
+
+
+def load_or_train(name, df, params, train_fn):
+    """Returns the bundle for (df, params), training and saving it only if needed.
+
+    `train_fn(df, **params)` must return a dict with the ModelBundle fields other
+    than `version`. Each artifact is deserialized at most once per process and
+    the returned bundle is read-only, so it can be shared between sessions.
+    """
+    version = artifact_version(df, params)
+    bundle = _loaded_bundles.get((name, version))
+    if bundle is not None:
+        return bundle
+
+    with _artifact_lock(name, version):
+        bundle = _loaded_bundles.get((name, version))
+        if bundle is None:
+            bundle = load_bundle(name, version)
+            if bundle is None:
+                fields = train_fn(df, **params)
+                metadata = {**fields.pop("metadata", {}), "params": params}
+                bundle = ModelBundle(version=version, metadata=metadata, **fields)
+                save_bundle(name, bundle)
+            bundle = read_only(bundle)
+            _loaded_bundles[name, version] = bundle
+    return bundle
+
+
+def latest_bundle(name, params):
+    """Returns the most recently saved bundle trained with params, or None.
+
+    Used to serve a model immediately at startup, before knowing whether it
+    matches the current data.
+    """
+    paths = sorted(glob.glob(artifact_path(name, "*")), key=os.path.getmtime, reverse=True)
+    for path in paths:
+        version = os.path.basename(path)[len(name) + 1:-len(".joblib")]
+        with _artifact_lock(name, version):
+            bundle = _loaded_bundles.get((name, version))
+            if bundle is None:
+                try:
+                    bundle = load_bundle(name, version)
+                    if bundle is None:
+                        continue
+                    bundle = read_only(bundle)
+                except Exception:  # Unreadable artifact (e.g. from another library version or format)
+                    continue
+                _loaded_bundles[name, version] = bundle
+        if bundle.metadata.get("params") == params:
+            return bundle
+    return None
+
+
+def _artifact_lock(name, version):
+    with _registry_lock:
+        return _artifact_locks.setdefault((name, version), threading.Lock())
@@ -0,0 +1,152 @@
+"""Cross-validated search over the decision tree settings and the feature count.
+
+Evaluates a grid (or a random sample of it) of max_depth, criterion,
+min_samples_leaf and n_features with k-fold cross-validation, spreading the
+configurations over all cores, prints a leaderboard and records the best
+configuration next to the model registry's artifacts, where the app, the batch
+scorer and the prediction server read their training parameters (restart them
+to serve it). A model trained with it is saved right away.
+
+    python model_search.py --cv 5 --n-iter 40 --jobs -1
+"""
+import argparse  # For the command-line interface
+import sys  # For log output and exit codes
+import time  # For per-configuration fit times
+
+import numpy as np  # For fold matrices
+import pandas as pd  # For the leaderboard
+from joblib import Parallel, delayed  # For evaluating configurations on all cores
+from sklearn.model_selection import KFold, ParameterGrid, ParameterSampler
+from sklearn.tree import DecisionTreeClassifier
+
+import data_cache  # For the columnar cache of the training spreadsheet
+import model_registry  # For saving the best configuration with the model
+from career_model import (
+    ASSESSMENT_DATA_PATH, ASSESSMENT_MODEL, ASSESSMENT_PARAMS, ASSESSMENT_SHEET, fit_model_bundle, fit_ranking,
+    preprocess_data, top_features,
+)
+from preprocessing import TARGET
+
+# n_features=None keeps every feature
+DEFAULT_GRID = {
+    "max_depth": [3, 5, 8, 12, None],
+    "criterion": ["gini", "entropy"],
+    "min_samples_leaf": [1, 2, 5, 10],
+    "n_features": [10, 20, 30, None],
+}
+
+LEADERBOARD_SIZE = 10  # Rows of the leaderboard stored in the artifact
+# How the leaderboard shows a setting left at None
+NONE_LABELS = {"n_features": "all", "max_depth": "unlimited"}
+
+
+# ====================== CONFIGURATIONS ======================
+def candidate_configs(grid=None, n_iter=None, random_state=42):
+    """Returns every configuration of the grid, or n_iter of them sampled at random"""
+    grid = DEFAULT_GRID if grid is None else grid
+    if n_iter is None or n_iter >= len(ParameterGrid(grid)):
+        return list(ParameterGrid(grid))
+    return list(ParameterSampler(grid, n_iter, random_state=random_state))
+
+
+# ====================== CROSS-VALIDATION ======================
+def _score_config(X, y, folds, rankings, config):
+    """Trains and scores one configuration on every fold (runs in a worker)"""
+    tree_params = {key: value for key, value in config.items() if key != "n_features"}
+    started = time.perf_counter()
+    scores = []
+    for (train_idx, test_idx), ranking in zip(folds, rankings):
+        columns = top_features(ranking, config.get("n_features"))
+        clf = DecisionTreeClassifier(random_state=42, **tree_params)
+        clf.fit(X[np.ix_(train_idx, columns)], y[train_idx])
+        scores.append(clf.score(X[np.ix_(test_idx, columns)], y[test_idx]))
+    return {
+        **config,
+        "mean_accuracy": float(np.mean(scores)),
+        "std_accuracy": float(np.std(scores)),
+        "fit_seconds": (time.perf_counter() - started) / len(folds),
+    }
+
+
+def search(X, y, grid=None, cv=5, n_iter=None, n_jobs=-1, random_state=42):
+    """Cross-validates the candidate configurations on an encoded DataFrame; returns results, best first"""
+    folds = list(KFold(n_splits=cv, shuffle=True, random_state=random_state).split(X))
+    # Feature selection is learned inside each fold, once per fold for all configurations.
+    # Fold rankings are never needed again, so they skip the on-disk ranking cache.
+    rankings = [fit_ranking(X.iloc[train_idx], y.iloc[train_idx]) for train_idx, _ in folds]
+    X = X.to_numpy(dtype=np.float32)
+    y = y.to_numpy()
+    configs = candidate_configs(grid, n_iter, random_state)
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_score_config)(X, y, folds, rankings, config) for config in configs
+    )
+    # Ties go to the more stable configuration, then to grid order
+    return sorted(results, key=lambda r: (-r["mean_accuracy"], r["std_accuracy"]))
+
+
+def leaderboard(results, limit=None):
+    """Returns the search results as a ranked DataFrame"""
+    rows = [
+        {key: NONE_LABELS[key] if value is None and key in NONE_LABELS else value for key, value in result.items()}
+        for result in results[:limit]
+    ]
+    board = pd.DataFrame(rows)
+    board.index = pd.RangeIndex(1, len(board) + 1, name="rank")
+    return board
+
+
+# ====================== BEST MODEL ======================
+def best_params(results):
+    """Returns the training parameters (tree settings and n_features) of the best result"""
+    best = results[0]
+    return {key: best[key] for key in best if key not in ("mean_accuracy", "std_accuracy", "fit_seconds")}
+
+
+def search_and_publish(df, name=ASSESSMENT_MODEL, cv=5, n_iter=None, grid=None, n_jobs=-1, random_state=42):
+    """Searches the best configuration, records it as the model's training parameters and
+    returns (results, bundle trained with them).
+
+    The app, the batch scorer and the prediction server read the recorded
+    parameters (career_model.assessment_params) when they start, so they serve
+    this configuration, and retrain with it when the data changes.
+    """
+    df_processed, _ = preprocess_data(df)
+    X = df_processed.drop(TARGET, axis=1)
+    y = df_processed[TARGET]
+
+    results = search(X, y, grid, cv, n_iter, n_jobs, random_state)
+    params = {**ASSESSMENT_PARAMS, **best_params(results)}
+    model_registry.save_tuned_params(
+        name, params, cv_accuracy=results[0]["mean_accuracy"], cv=cv, n_iter=n_iter,
+        leaderboard=results[:LEADERBOARD_SIZE],
+    )
+    bundle = model_registry.load_or_train(name, df, params, fit_model_bundle)
+    return results, bundle
+
+
+# ====================== CLI ======================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search decision tree settings with k-fold cross-validation.")
+    parser.add_argument("--train-data", default=ASSESSMENT_DATA_PATH, help="Spreadsheet to search on")
+    parser.add_argument("--sheet", default=ASSESSMENT_SHEET, help="Sheet of --train-data to use")
+    parser.add_argument("--name", default=ASSESSMENT_MODEL, help="Registry name the best configuration is recorded for")
+    parser.add_argument("--cv", type=int, default=5, help="Number of cross-validation folds")
+    parser.add_argument("--n-iter", type=int, help="Sample this many configurations instead of the full grid")
+    parser.add_argument("--jobs", type=int, default=-1, help="Parallel workers (-1 uses all cores)")
+    parser.add_argument("--top", type=int, default=LEADERBOARD_SIZE, help="Leaderboard rows to print")
+    args = parser.parse_args(argv)
+    if args.cv < 2:
+        parser.error("--cv must be at least 2")
+
+    df = data_cache.read_excel_cached(args.train_data, sheet_name=args.sheet)
+    started = time.perf_counter()
+    results, bundle = search_and_publish(df, args.name, args.cv, args.n_iter, n_jobs=args.jobs)
+
+    print(leaderboard(results, args.top).to_string(float_format="%.4f"))
+    print(f"Best {best_params(results)} (cv accuracy {results[0]['mean_accuracy']:.4f}) recorded for {args.name}; "
+          f"model {bundle.version} trained with it in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
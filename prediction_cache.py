@@ -0,0 +1,184 @@
+import os  # For the default store location
+import sqlite3  # For the store shared by all processes
+import threading  # For the lock shared by the LRU and the connection
+import time  # For the last use of each model version
+from collections import OrderedDict  # For the in-process LRU
+
+import numpy as np  # For packing encoded answer vectors
+
+# ====================== PREDICTION CACHE ======================
+# Answers are almost all discrete, so the same encoded vectors come back again
+# and again. The cache maps (model version, packed float32 vector) to the leaf
+# the tree reaches; the leaf gives both the predicted class and the class
+# probabilities, so one entry serves every kind of prediction and any top_k.
+# Lookups go to an in-process LRU first, then to a SQLite file shared by all
+# processes. The model version is part of the key, so a retrained artifact
+# never reads stale entries. Processes sharing the file may serve different
+# versions (e.g. during a retrain), so each one records when it last used its
+# version, and only the rows of versions no process used for VERSION_MAX_IDLE
+# seconds are dropped. Each process keeps one connection, used under the LRU's
+# lock: Streamlit runs every script run on a new thread, so per-thread
+# connections would reopen the file (and reset its journal mode) on every miss.
+
+# SQLite file shared by the app and server processes
+CACHE_PATH = os.environ.get("CAREER_PREDICTION_CACHE", os.path.join(".cache", "predictions.sqlite"))
+
+DEFAULT_MAX_ENTRIES = 4096  # Entries kept in each process's LRU
+VERSION_MAX_IDLE = 24 * 3600  # Seconds after which entries of an unused version are dropped
+VERSION_TOUCH_INTERVAL = 600  # Seconds between two updates of a version's last use
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    model TEXT NOT NULL,
+    version TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    leaf INTEGER NOT NULL,
+    PRIMARY KEY (model, version, vector)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS versions (
+    model TEXT NOT NULL,
+    version TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (model, version)
+) WITHOUT ROWID;
+"""
+
+
+class PredictionCache:
+    """Two-tier (LRU + SQLite) cache of tree leaves per model version and encoded answers"""
+
+    def __init__(self, name, path=CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.name = name
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0  # Served from this process's LRU
+        self.disk_hits = 0  # Served from the shared store
+        self.misses = 0  # Computed by walking the tree
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None  # SQLite connection of this process, opened on first use
+        self._touched = {}  # Version -> when this process last recorded using it
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with self._lock, self._connection() as conn:
+                conn.executescript(_SCHEMA)
+
+    # ---------- lookups ----------
+    def leaf(self, bundle, vector):
+        """Returns the leaf reached by one encoded answer vector, walking the tree only on a miss"""
+        return int(self.leaves(bundle, [vector])[0])
+
+    def predict_one(self, bundle, vector):
+        """Cached equivalent of bundle.tree.predict_one"""
+        return bundle.tree.leaf_class[self.leaf(bundle, vector)]
+
+    def leaves(self, bundle, X):
+        """Returns the leaf of every row of an encoded matrix; misses are computed in one batch"""
+        X = np.asarray(X, dtype=np.float32)
+        self._touch_version(bundle.version)
+        keys = [row.tobytes() for row in X]
+        leaves = np.empty(len(keys), dtype=np.intp)
+
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                leaf = self._lru.get((bundle.version, key))
+                if leaf is None:
+                    missing.append(i)
+                else:
+                    self._lru.move_to_end((bundle.version, key))
+                    leaves[i] = leaf
+            self.hits += len(keys) - len(missing)
+
+        stored = self._load(bundle.version, [keys[i] for i in missing]) if missing else {}
+        computed = [i for i in missing if keys[i] not in stored]
+        for i in missing:
+            if keys[i] in stored:
+                leaves[i] = stored[keys[i]]
+        if computed:
+            leaves[computed] = bundle.tree.apply(X[computed])
+            self._store(bundle.version, [(keys[i], int(leaves[i])) for i in computed])
+
+        with self._lock:
+            self.disk_hits += len(missing) - len(computed)
+            self.misses += len(computed)
+            for i in missing:
+                self._lru[bundle.version, keys[i]] = int(leaves[i])
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+        return leaves
+
+    def stats(self):
+        """Returns the hit/miss counters of this process"""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "entries": len(self._lru),
+        }
+
+    # ---------- shared store ----------
+    def _connection(self):
+        # Callers hold self._lock; the connection is shared by all threads
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")  # Readers never wait for writers
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn = conn
+        return self._conn
+
+    def _load(self, version, keys):
+        if not self.path:
+            return {}
+        found = {}
+        try:
+            with self._lock:
+                conn = self._connection()
+                for start in range(0, len(keys), 500):  # Stay below SQLite's parameter limit
+                    batch = keys[start:start + 500]
+                    rows = conn.execute(
+                        "SELECT vector, leaf FROM predictions WHERE model = ? AND version = ? "
+                        f"AND vector IN ({', '.join('?' * len(batch))})",
+                        [self.name, version, *batch],
+                    )
+                    found.update(rows)
+        except sqlite3.Error:
+            pass  # The shared store is best effort; the tree is always available
+        return found
+
+    def _store(self, version, entries):
+        if not self.path:
+            return
+        try:
+            with self._lock, self._connection() as conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO predictions (model, version, vector, leaf) VALUES (?, ?, ?, ?)",
+                    [(self.name, version, key, leaf) for key, leaf in entries],
+                )
+        except sqlite3.Error:
+            pass
+
+    def _touch_version(self, version):
+        # Records that this process serves version and drops the rows of versions
+        # nobody served recently, at most once per VERSION_TOUCH_INTERVAL
+        now = time.time()
+        if now - self._touched.get(version, 0) < VERSION_TOUCH_INTERVAL:
+            return
+        self._touched[version] = now
+        if not self.path:
+            return
+        try:
+            with self._lock, self._connection() as conn:
+                conn.execute("INSERT OR REPLACE INTO versions (model, version, last_used) VALUES (?, ?, ?)",
+                             (self.name, version, now))
+                conn.execute(
+                    "DELETE FROM predictions WHERE model = ? AND version NOT IN "
+                    "(SELECT version FROM versions WHERE model = ? AND last_used >= ?)",
+                    (self.name, self.name, now - VERSION_MAX_IDLE),
+                )
+                conn.execute("DELETE FROM versions WHERE model = ? AND last_used < ?",
+                             (self.name, now - VERSION_MAX_IDLE))
+        except sqlite3.Error:
+            pass
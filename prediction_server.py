@@ -0,0 +1,301 @@
+"""Stand-alone HTTP prediction service for the models of the Streamlit app.
+
+Serves the same models, encoders and feature lists as both apps, loaded from
+the model registry:
+
+    assessment     trained on --train-data like the batch scorer. The default,
+                   Book1.xlsx, is not part of the repository; pass the
+                   spreadsheet to use (e.g. --train-data new_updated_data.xlsx).
+    career_match   the newest model the career match app saved (run the app
+                   once with the same CAREER_ARTIFACT_DIR to train it). Answers
+                   the questionnaire does not ask about take their most common
+                   value, as in the app.
+
+Models that cannot be loaded are skipped with a warning. Requests are parsed
+on an asyncio event loop and the CPU-bound encoding and tree walks run in a
+bounded process pool.
+
+    python prediction_server.py --port 8080 --workers 4 --train-data new_updated_data.xlsx
+
+    POST /predict  {"answers": {"Interest": "Technology", ...}, "top_k": 3}
+    POST /predict  {"answers": [{...}, {...}]}          (batch)
+    POST /predict  {"model": "career_match", "answers": {...}}
+    GET  /healthz                                       (served versions and prediction cache counters)
+"""
+import argparse  # For the command-line interface
+import asyncio  # For the event loop and bounded concurrency
+import json  # For request and response bodies
+import os  # For the default worker count
+import sys  # For log output
+from concurrent.futures import ProcessPoolExecutor  # For CPU-bound predictions
+
+import model_registry  # For the career match app's saved model
+from batch_score import load_bundle  # Same model loading as the batch scorer
+from career_model import (
+    ASSESSMENT_DATA_PATH, ASSESSMENT_MODEL, ASSESSMENT_SHEET, CAREER_MATCH_MODEL, CAREER_MATCH_PARAMS,
+    top_careers,
+)
+from prediction_cache import CACHE_PATH, PredictionCache  # For repeated answer vectors
+from preprocessing import MissingAnswersError  # Answers without a required feature
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_BATCH_SIZE = 10_000
+MODELS = (ASSESSMENT_MODEL, CAREER_MATCH_MODEL)
+# Models whose questionnaire covers only some features; the others take the training mode
+FILL_MISSING = {CAREER_MATCH_MODEL}
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    """A client error reported back as an HTTP status and message"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ====================== MODEL LOADING ======================
+def load_model(name, train_data, sheet_name):
+    """Returns the bundle served as `name`; raises if it cannot be loaded"""
+    if name == ASSESSMENT_MODEL:
+        return load_bundle(train_data, sheet_name)
+    if name == CAREER_MATCH_MODEL:
+        bundle = model_registry.latest_bundle(CAREER_MATCH_MODEL, CAREER_MATCH_PARAMS)
+        if bundle is None:
+            raise LookupError(f"no saved {CAREER_MATCH_MODEL} model in {model_registry.ARTIFACT_DIR!r}; "
+                              "run the Streamlit app once to train it")
+        return bundle
+    raise ValueError(f"Unknown model {name!r}")
+
+
+def load_models(names, train_data, sheet_name):
+    """Returns {name: bundle} for the models that could be loaded, warning about the others"""
+    bundles = {}
+    for name in names:
+        try:
+            bundles[name] = load_model(name, train_data, sheet_name)
+        except Exception as exc:
+            print(f"not serving {name}: {exc}", file=sys.stderr)
+    return bundles
+
+
+# ====================== WORKER PROCESSES ======================
+# Each worker deserializes the exact artifact versions the parent loaded, once,
+# in its initializer (a newer artifact saved meanwhile is not picked up, so the
+# versions reported in responses are the ones that scored them), and keeps its
+# own LRU per model in front of the prediction store shared by all workers.
+_worker_bundles = {}
+_worker_caches = {}
+
+
+def _init_worker(versions, cache_path):
+    for name, version in versions.items():
+        bundle = model_registry.load_bundle(name, version)
+        if bundle is None:
+            raise LookupError(f"{name} artifact {version} is no longer in {model_registry.ARTIFACT_DIR!r}")
+        _worker_bundles[name] = bundle
+        _worker_caches[name] = PredictionCache(name, path=cache_path)
+
+
+def predict_answers(name, answer_rows, top_k):
+    """Scores a list of answer dicts with model `name` in a worker.
+
+    Returns the JSON-ready predictions, the worker's pid and its cache counters.
+    """
+    bundle = _worker_bundles[name]
+    cache = _worker_caches[name]
+    X = bundle.preprocessor.transform_rows(answer_rows, bundle.selected_features, fill_missing=name in FILL_MISSING)
+    proba = bundle.tree.proba_array[cache.leaves(bundle, X)]
+    careers, probabilities = top_careers(proba, bundle, top_k)
+    predictions = [
+        {
+            "career": str(row_careers[0]),
+            "probabilities": {str(name): round(float(p), 6) for name, p in zip(row_careers, row_probs)
+                              if name is not None},
+        }
+        for row_careers, row_probs in zip(careers, probabilities)
+    ]
+    return predictions, os.getpid(), cache.stats()
+
+
+# ====================== HTTP SERVER ======================
+class PredictionServer:
+    """Minimal HTTP/1.1 JSON server dispatching predictions to a process pool"""
+
+    def __init__(self, bundles, executor, max_pending):
+        self.bundles = bundles  # Model name -> bundle, the first one is the default
+        self.executor = executor
+        self.pending = asyncio.Semaphore(max_pending)  # Backpressure on queued work
+        self.cache_stats = {}  # (worker pid, model) -> latest prediction cache counters
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except RequestError as exc:
+                    await self._respond(writer, exc.status, {"error": str(exc)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                status, payload = await self._dispatch(method, path, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, path, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise RequestError(400, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise RequestError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise RequestError(413, f"Body larger than {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b""
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method, path.split("?", 1)[0], body, keep_alive
+
+    async def _dispatch(self, method, path, body):
+        try:
+            if path == "/healthz":
+                return 200, {"status": "ok",
+                             "models": {name: bundle.version for name, bundle in self.bundles.items()},
+                             "prediction_cache": self._cache_totals()}
+            if path != "/predict":
+                raise RequestError(404, f"Unknown path {path}")
+            if method != "POST":
+                raise RequestError(405, "Use POST for /predict")
+            return 200, await self._predict(body)
+        except RequestError as exc:
+            return exc.status, {"error": str(exc)}
+        except MissingAnswersError as exc:
+            return 400, {"error": str(exc)}
+        except Exception as exc:  # Keep serving after unexpected worker errors
+            print(f"prediction failed: {exc!r}", file=sys.stderr)
+            return 500, {"error": "Prediction failed"}
+
+    async def _predict(self, body):
+        try:
+            payload = json.loads(body)
+            answers = payload["answers"]
+            top_k = int(payload.get("top_k", 3))
+            name = payload.get("model", next(iter(self.bundles)))
+        except (ValueError, TypeError, KeyError, AttributeError):
+            raise RequestError(400, 'Expected a JSON object with an "answers" field')
+        if name not in self.bundles:
+            raise RequestError(400, f"Unknown model {name!r}; serving {', '.join(self.bundles)}")
+
+        batched = isinstance(answers, list)
+        rows = answers if batched else [answers]
+        if not rows or not all(isinstance(row, dict) for row in rows):
+            raise RequestError(400, '"answers" must be an object or a non-empty list of objects')
+        if len(rows) > MAX_BATCH_SIZE:
+            raise RequestError(413, f"At most {MAX_BATCH_SIZE} answer sets per request")
+        if top_k < 1:
+            raise RequestError(400, '"top_k" must be positive')
+
+        async with self.pending:
+            loop = asyncio.get_running_loop()
+            predictions, pid, stats = await loop.run_in_executor(
+                self.executor, predict_answers, name, rows, top_k)
+        self.cache_stats[pid, name] = stats
+
+        response = {"model": name, "model_version": self.bundles[name].version}
+        if batched:
+            response["predictions"] = predictions
+        else:
+            response.update(predictions[0])
+        return response
+
+    def _cache_totals(self):
+        totals = {"hits": 0, "disk_hits": 0, "misses": 0}
+        for stats in self.cache_stats.values():
+            for counter in totals:
+                totals[counter] += stats[counter]
+        lookups = sum(totals.values())
+        totals["hit_rate"] = round((totals["hits"] + totals["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return totals
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host, port, workers, max_pending, models, train_data, sheet_name, cache_path):
+    # Train (or load) once in the parent so workers only deserialize the artifacts
+    bundles = load_models(models, train_data, sheet_name)
+    if not bundles:
+        raise SystemExit("No model could be loaded")
+    versions = {name: bundle.version for name, bundle in bundles.items()}
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(versions, cache_path)
+    ) as executor:
+        server = PredictionServer(bundles, executor, max_pending)
+        tcp_server = await asyncio.start_server(server.handle_connection, host, port)
+        served = ", ".join(f"{name} {bundle.version}" for name, bundle in bundles.items())
+        print(f"Serving {served} on http://{host}:{port} with {workers} workers", file=sys.stderr)
+        async with tcp_server:
+            await tcp_server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve career predictions over HTTP.",
+                                     formatter_class=argparse.RawDescriptionHelpFormatter, epilog=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes running predictions")
+    parser.add_argument("--max-pending", type=int, default=256,
+                        help="Prediction jobs queued before new requests wait")
+    parser.add_argument("--models", nargs="+", choices=MODELS, default=list(MODELS),
+                        help="Models to serve; the first one loaded answers requests without a \"model\"")
+    parser.add_argument("--train-data", default=ASSESSMENT_DATA_PATH,
+                        help="Spreadsheet the assessment model is trained on (the default, Book1.xlsx, "
+                             "is not in the repository)")
+    parser.add_argument("--sheet", default=ASSESSMENT_SHEET, help="Sheet of --train-data to use")
+    parser.add_argument("--prediction-cache", default=CACHE_PATH,
+                        help="SQLite file of cached predictions shared by all workers (empty to disable)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_pending,
+                          args.models, args.train_data, args.sheet, args.prediction_cache))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import numpy as np  # For encoded matrices and the target lookup array
+import pandas as pd  # For vectorized category lookups
+
+# ====================== PREPROCESSING PIPELINE ======================
+# One object holds the ordinal mapping of every categorical feature and of the
+# target. It is fitted once at training time, stored in the model artifact and
+# only *used* afterwards: encoding a DataFrame or an answer dict is a lookup,
+# and decoding a prediction indexes a precomputed array. Codes are the sorted
+# category positions, i.e. exactly what LabelEncoder would produce.
+
+TARGET = "Predicted_Career_Field"
+
+
+class MissingAnswersError(KeyError):
+    """Answers lack features the model needs (raised unless fill_missing is set)"""
+
+    def __str__(self):
+        return self.args[0]  # KeyError would quote the message
+
+
+def is_categorical(series):
+    """True for text columns (object dtype, or the str dtype of pandas >= 3)"""
+    return pd.api.types.is_string_dtype(series.dtype)
+
+
+class OrdinalPipeline:
+    """Fit-once ordinal encoder for all features and the target"""
+
+    def __init__(self, target=TARGET):
+        self.target = target
+        self.features = []
+        self.categories = {}  # feature -> sorted category array
+        self.codes = {}  # feature -> {category: code}
+        self.fill_values = {}  # feature -> code/value used for unanswered features
+        self.target_classes = np.array([], dtype=object)
+
+    def fit(self, df):
+        """Learns the categories of every text column and of the target"""
+        self.features = [col for col in df.columns if col != self.target]
+        for col in self.features:
+            if is_categorical(df[col]):
+                values = df[col].astype(str)
+                categories = np.array(sorted(values.unique()), dtype=object)
+                self.categories[col] = categories
+                self.codes[col] = {category: code for code, category in enumerate(categories)}
+                self.fill_values[col] = self.codes[col][values.mode().iloc[0]]
+            else:
+                median = pd.to_numeric(df[col], errors="coerce").median()
+                self.fill_values[col] = 0.0 if pd.isna(median) else float(median)
+        if self.target in df.columns:
+            self.target_classes = np.array(sorted(df[self.target].astype(str).unique()), dtype=object)
+        return self
+
+    # ---------- training ----------
+    def encode_frame(self, df):
+        """Returns a copy of df with categorical features and the target replaced by codes"""
+        df = df.copy()
+        for col in self.categories:
+            if col in df.columns:
+                df[col] = self._lookup(df[col], col).astype(np.int64)
+        if self.target in df.columns:
+            df[self.target] = self.encode_target(df[self.target])
+        return df
+
+    def encode_target(self, y):
+        """Encodes career names into target codes"""
+        return pd.Categorical(pd.Series(y).astype(str), categories=self.target_classes).codes.astype(np.int64)
+
+    # ---------- serving ----------
+    def transform(self, df, features=None, fill_missing=False):
+        """Encodes a DataFrame of raw answers into a float32 matrix (one column per feature).
+
+        Unseen categories map to code 0; non-numeric or missing (NaN/None)
+        numbers take the training median. Missing columns raise MissingAnswersError unless
+        fill_missing substitutes the training mode (or median).
+        """
+        features = self.features if features is None else features
+        self._check_missing(features, df.columns, fill_missing)
+        X = np.empty((len(df), len(features)), dtype=np.float32)
+        for i, col in enumerate(features):
+            if col not in df.columns:
+                X[:, i] = self.fill_values[col]
+            elif col in self.categories:
+                X[:, i] = self._lookup(df[col], col)
+            else:
+                X[:, i] = pd.to_numeric(df[col], errors="coerce").fillna(self.fill_values[col]).to_numpy()
+        return X
+
+    def transform_rows(self, rows, features=None, fill_missing=False):
+        """Encodes a list of answer dicts like transform(), with dict lookups instead of pandas"""
+        features = self.features if features is None else features
+        X = np.empty((len(rows), len(features)), dtype=np.float32)
+        for r, answers in enumerate(rows):
+            self._check_missing(features, answers, fill_missing)
+            for i, col in enumerate(features):
+                if col not in answers:
+                    X[r, i] = self.fill_values[col]
+                elif col in self.codes:
+                    X[r, i] = self.codes[col].get(str(answers[col]), 0)
+                else:
+                    X[r, i] = self._number(answers[col], col)
+        return X
+
+    def transform_one(self, answers, features=None, fill_missing=False):
+        """Encodes a single answer dict into a plain list, ready for CompiledTree.predict_one"""
+        return self.transform_rows([answers], features, fill_missing)[0].tolist()
+
+    def unseen_values(self, answers, features=None):
+        """Returns (feature, value) pairs of answers that were not seen during training"""
+        features = self.features if features is None else features
+        return [
+            (col, answers[col]) for col in features
+            if col in self.codes and col in answers and str(answers[col]) not in self.codes[col]
+        ]
+
+    def decode(self, codes):
+        """Maps target codes back to career names"""
+        return self.target_classes[np.asarray(codes, dtype=np.intp)]
+
+    # ---------- helpers ----------
+    def _lookup(self, values, col):
+        codes = pd.Categorical(values.astype(str), categories=self.categories[col]).codes
+        return np.where(codes < 0, 0, codes)
+
+    def _number(self, value, col):
+        # Same rule as pd.to_numeric(errors="coerce").fillna(median) in transform()
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return self.fill_values[col]
+        return self.fill_values[col] if np.isnan(number) else number
+
+    @staticmethod
+    def _check_missing(features, available, fill_missing):
+        if fill_missing:
+            return
+        missing = [col for col in features if col not in available]
+        if missing:
+            raise MissingAnswersError(f"Missing answer columns: {', '.join(missing)}")
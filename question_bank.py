@@ -0,0 +1,123 @@
+import json  # For the question data file
+import os  # For the data file location and modification time
+import random  # For sampling questions
+import sys  # For interning repeated strings
+import threading  # For loading each bank once per process
+
+# ====================== QUESTION BANK ======================
+# Questions live in questions.json, grouped in named banks, and are loaded once
+# per process into immutable Question objects. A question's ID is its position
+# in its bank, so lookups by ID, by feature and random sampling are all O(1)
+# per question, whatever the size of the pool. Repeated strings (feature names,
+# option values such as "High" or "Yes") are interned so each is stored once.
+
+QUESTIONS_PATH = os.environ.get(
+    "CAREER_QUESTIONS_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "questions.json")
+)
+
+
+class Question:
+    """One question with its answer options as (label, value) pairs"""
+    __slots__ = ("id", "feature", "text", "labels", "values", "_value_of")
+
+    def __init__(self, qid, feature, text, options):
+        self.id = qid
+        self.feature = sys.intern(feature)
+        self.text = text
+        self.labels = tuple(sys.intern(label) for label, _ in options)
+        self.values = tuple(sys.intern(value) for _, value in options)
+        self._value_of = dict(zip(self.labels, self.values))
+
+    def value(self, label):
+        """Returns the raw answer value of an option label"""
+        return self._value_of[label]
+
+    def __repr__(self):
+        return f"Question({self.id}, {self.feature!r}, {self.text!r})"
+
+
+class QuestionBank:
+    """Immutable pool of questions indexed by ID and by feature"""
+
+    def __init__(self, questions):
+        self.questions = tuple(questions)
+        ids_by_feature = {}
+        for question in self.questions:
+            ids_by_feature.setdefault(question.feature, []).append(question.id)
+        self.ids_by_feature = {feature: tuple(ids) for feature, ids in ids_by_feature.items()}
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __getitem__(self, qid):
+        return self.questions[qid]
+
+    def __contains__(self, feature):
+        return feature in self.ids_by_feature
+
+    @property
+    def features(self):
+        return tuple(self.ids_by_feature)
+
+    def is_valid(self, qid, feature=None):
+        """True if qid names a question of this bank (asking about feature, if given)"""
+        if not isinstance(qid, int) or not 0 <= qid < len(self.questions):
+            return False
+        return feature is None or self.questions[qid].feature == feature
+
+    def for_feature(self, feature):
+        """Returns the questions asking about a feature"""
+        return tuple(self.questions[qid] for qid in self.ids_by_feature.get(feature, ()))
+
+    def random_id(self, feature, rng=random):
+        """Returns the ID of a random question for a feature"""
+        return rng.choice(self.ids_by_feature[feature])
+
+    def sample_ids(self, k, one_per_feature=True, rng=random):
+        """Returns k random question IDs in random order.
+
+        With one_per_feature, every feature is covered first (so more than k IDs
+        are returned when there are more features than k) and the rest are drawn
+        from the whole pool without repeats. Costs O(k + features), not O(pool).
+        """
+        chosen = [self.random_id(feature, rng) for feature in self.ids_by_feature] if one_per_feature else []
+        taken = set(chosen)
+        needed = min(k, len(self.questions)) - len(chosen)
+        # Rejection sampling: O(1) expected per draw while the sample is small next to the pool
+        while needed > 0:
+            qid = rng.randrange(len(self.questions))
+            if qid not in taken:
+                taken.add(qid)
+                chosen.append(qid)
+                needed -= 1
+        rng.shuffle(chosen)
+        return chosen
+
+    @classmethod
+    def from_records(cls, records):
+        """Builds a bank from dicts with "feature", "question" and "options" ([label, value] pairs)"""
+        return cls(
+            Question(qid, record["feature"], record["question"], record["options"])
+            for qid, record in enumerate(records)
+        )
+
+
+# Banks already loaded in this process, keyed by (path, bank name)
+_banks = {}
+_load_lock = threading.Lock()
+
+
+def load_bank(name, path=QUESTIONS_PATH):
+    """Returns the named question bank, reading the data file only when it changed"""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _banks.get((path, name))
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with _load_lock:
+        cached = _banks.get((path, name))
+        if cached is None or cached[0] != mtime:
+            with open(path, encoding="utf-8") as data_file:
+                records = json.load(data_file)[name]
+            cached = (mtime, QuestionBank.from_records(records))
+            _banks[path, name] = cached
+    return cached[1]
@@ -0,0 +1,14 @@
+"""Runs the career app with long-lived cache headers on its static assets.
+
+    streamlit run serve.py
+
+Equivalent to `streamlit run app.py`, except that the hashed welcome-screen
+variants in static/ are sent with Cache-Control: immutable, so browsers keep
+them instead of downloading them again on every visit.
+"""
+import streamlit as st
+from starlette.middleware import Middleware
+
+from static_assets import CacheHeadersMiddleware
+
+app = st.App("app.py", middleware=[Middleware(CacheHeadersMiddleware)])
@@ -0,0 +1,137 @@
+"""Builds the resized, recompressed variants of the welcome-screen background.
+
+The source photo is resolved once, converted to WebP at a few widths and
+written to the app's static/ folder, which Streamlit serves at app/static/
+when server.enableStaticServing is on. Run at deploy time to prebuild them:
+
+    python static_assets.py
+
+Streamlit's static route sends no Cache-Control header; serve.py runs the app
+with CacheHeadersMiddleware, which marks the variants as immutable.
+"""
+import hashlib  # For content-addressed variant names
+import os  # For locating the source image and listing variants
+import sys  # For log output and exit codes
+
+from PIL import Image, ImageOps  # For resizing and recompressing the photo
+
+from atomic_files import write_atomic  # Readers never see a partial variant
+
+# ====================== WELCOME BACKGROUND ======================
+# Variant names embed a hash of the source image and of the encoding settings,
+# so a URL always refers to the same bytes: browsers and proxies can keep them
+# as long as they like, and a new photo simply gets new URLs.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Folder Streamlit serves as app/static/ (it must sit next to the main script)
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+STATIC_URL = "app/static"
+
+# Places the welcome photo is looked for, first match wins
+WELCOME_IMAGE_PATHS = [
+    os.environ.get("CAREER_WELCOME_IMAGE", ""),
+    os.path.join(BASE_DIR, "Image.jpeg"),
+    os.path.join(BASE_DIR, "assets", "Image.jpeg"),
+    os.path.join(BASE_DIR, "resources", "Image.jpeg"),
+]
+
+VARIANT_WIDTHS = (640, 1280, 1920)  # Phones, laptops, large screens
+WEBP_QUALITY = 80
+_PREFIX = "welcome-"
+
+
+def find_welcome_image(paths=None):
+    """Returns the first existing welcome photo, or None"""
+    for path in WELCOME_IMAGE_PATHS if paths is None else paths:
+        if path and os.path.isfile(path):
+            return path
+    return None
+
+
+def _variant_tag(source_bytes, widths, quality):
+    digest = hashlib.sha256(source_bytes)
+    digest.update(repr((tuple(widths), quality)).encode())
+    return digest.hexdigest()[:12]
+
+
+def build_variants(source, widths=VARIANT_WIDTHS, quality=WEBP_QUALITY, out_dir=STATIC_DIR):
+    """Writes the WebP variants of source into out_dir; returns [(width, file name), ...], smallest first.
+
+    Variants already on disk are reused, and variants of older photos or
+    settings are removed.
+    """
+    with open(source, "rb") as source_file:
+        source_bytes = source_file.read()
+    tag = _variant_tag(source_bytes, widths, quality)
+
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        # Never upscale: widths above the photo's own collapse into one variant
+        targets = sorted({min(width, image.width) for width in widths})
+        variants = [(width, f"{_PREFIX}{tag}-{width}.webp") for width in targets]
+
+        os.makedirs(out_dir, exist_ok=True)
+        for width, name in variants:
+            path = os.path.join(out_dir, name)
+            if os.path.exists(path):
+                continue
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.LANCZOS) if width != image.width else image
+            write_atomic(path, lambda tmp_path: resized.save(tmp_path, format="WEBP", quality=quality, method=6))
+
+    current = {name for _, name in variants}
+    for name in os.listdir(out_dir):
+        if name.startswith(_PREFIX) and name.endswith(".webp") and name not in current:
+            os.unlink(os.path.join(out_dir, name))
+    return variants
+
+
+def background_css(selector, variants, url_prefix=STATIC_URL):
+    """Returns CSS giving selector the smallest variant at least as wide as the viewport"""
+    rules = []
+    for i, (width, name) in enumerate(variants):
+        rule = f'{selector}{{background-image:url("{url_prefix}/{name}")}}'
+        if i < len(variants) - 1:
+            rule = f"@media (max-width:{width}px){{{rule}}}"
+        rules.append(rule)
+    # Largest first: on narrow screens the later, smaller matching rule wins
+    return "".join(reversed(rules))
+
+
+# ====================== CACHE HEADERS ======================
+class CacheHeadersMiddleware:
+    """ASGI middleware adding a long-lived Cache-Control header to the welcome variants"""
+
+    def __init__(self, app, max_age=365 * 24 * 3600):
+        self.app = app
+        self.header = (b"cache-control", f"public, max-age={max_age}, immutable".encode())
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "") if scope["type"] == "http" else ""
+        if f"/{STATIC_URL}/{_PREFIX}" not in path:
+            return await self.app(scope, receive, send)
+
+        async def send_with_header(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message["headers"] = [*message.get("headers", []), self.header]
+            await send(message)
+
+        await self.app(scope, receive, send_with_header)
+
+
+# ====================== CLI ======================
+def main():
+    source = find_welcome_image()
+    if source is None:
+        print("No welcome image found; looked in " + ", ".join(p for p in WELCOME_IMAGE_PATHS if p), file=sys.stderr)
+        return 1
+    for width, name in build_variants(source):
+        path = os.path.join(STATIC_DIR, name)
+        print(f"{width:>5}px  {os.path.getsize(path):>9,} B  {path}")
+    print(f"source {os.path.getsize(source):,} B  {source}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
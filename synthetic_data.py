@@ -0,0 +1,202 @@
+"""Generates synthetic career datasets of any size for load-testing training and inference.
+
+Rows follow the full schema the apps ask about: every feature of the question
+banks (Big Five, skills, preferences...) with the answer values the apps can
+send, plus the numeric and background columns of the real dataset. Each row
+belongs to a latent career; --correlation sets how strongly the features
+follow it and --noise the share of rows relabelled at random. Rows are
+generated and written to Parquet chunk by chunk, so memory stays flat.
+
+    python synthetic_data.py --rows 5000000 --output synthetic.parquet --classes 40 --seed 7
+"""
+import argparse  # For the command-line interface
+import os  # For file sizes
+import sys  # For log output and exit codes
+import time  # For the generation time
+
+import numpy as np  # For vectorized sampling
+import pandas as pd  # For in-memory frames
+
+from atomic_files import write_atomic  # Readers never see a partial file
+from preprocessing import TARGET
+from question_bank import load_bank
+
+# ====================== SCHEMA ======================
+DEFAULT_BANKS = ("assessment", "career_match")  # Question banks whose features are generated
+
+# Columns of the real dataset that no question asks about
+BACKGROUND_COLUMNS = {
+    "Field_of_Study": (
+        "Accounting", "Architecture", "Biology", "Business Administration", "Chemistry", "Civil Engineering",
+        "Computer Science", "Economics", "Education", "Engineering", "Environmental Science", "Finance",
+        "Fine Arts", "Graphic Design", "History", "Hospitality Management", "Information Technology",
+        "Journalism", "Law", "Marketing", "Mathematics", "Mechanical Engineering", "Medicine", "Nursing",
+        "Philosophy", "Physics", "Political Science", "Psychology", "Public Relations", "Sociology", "Statistics",
+    ),
+    "Highest_Degree": ("Bachelors", "Diploma", "Masters", "PhD"),
+    "Career_Goals": (
+        "Architecture", "Arts", "Business", "Consulting", "Design", "Doctor", "Education", "Engineering",
+        "Finance", "Hospitality", "Human Resources", "Journalism", "Lawyer", "Legal", "Marketing", "Mathematics",
+        "Medical", "Public Relations", "Sales", "Teaching", "Technology",
+    ),
+    "Work_Hour_Flexibility": ("9-5", "Freelance", "Shifts"),
+}
+
+# Numeric columns: (low, high, decimals), the ranges of the real dataset
+NUMERIC_COLUMNS = {
+    "GPA": (2.0, 4.0, 2),
+    "Years_of_Experience": (0, 20, 0),
+    "Certifications_Count": (0, 5, 0),
+    "Courses_Completed": (0, 10, 0),
+    "GitHub_Repos": (0, 20, 0),
+}
+
+# Careers of the real dataset
+CAREERS = (
+    "AI Researcher", "Actuary", "Animator", "Architecture", "Arts", "Astronomer", "Biotechnologist", "Business",
+    "Chef", "Civil Engineer", "Clinical Psychologist", "Consulting", "Content Writer", "Cybersecurity Analyst",
+    "Data Scientist", "Dentist", "Design", "Doctor", "Education", "Engineering", "Entrepreneur", "Event Planner",
+    "Finance", "Financial Planner", "Flight Attendant", "Game Developer", "Geologist", "Hospitality",
+    "Hotel Manager", "Human Resources", "Investment Banker", "Journalism", "Lawyer", "Legal", "Logistics Manager",
+    "Marketing", "Mathematics", "Mechanical Engineer", "Medical", "Pharmacist", "Public Relations",
+    "SEO Specialist", "Sales", "Social Media Manager", "Software Developer", "Teaching", "Technical Writer",
+    "Technology", "Therapist", "UX/UI Designer", "Veterinarian",
+)
+
+DEFAULT_CHUNK_ROWS = 250_000
+
+
+def build_schema(banks=DEFAULT_BANKS):
+    """Returns {categorical column: values} and {numeric column: (low, high, decimals)}.
+
+    A feature asked by several banks takes the answer values of all of them.
+    """
+    values = {}
+    for name in banks:
+        bank = load_bank(name)
+        for feature in bank.features:
+            options = values.setdefault(feature, set())
+            for question in bank.for_feature(feature):
+                options.update(question.values)
+    categorical = {feature: tuple(sorted(options)) for feature, options in values.items()}
+    for column, options in BACKGROUND_COLUMNS.items():
+        categorical.setdefault(column, options)
+    numeric = {column: spec for column, spec in NUMERIC_COLUMNS.items() if column not in categorical}
+    return categorical, numeric
+
+
+def career_names(n_classes):
+    """Returns n_classes career names (numbered beyond the built-in list)"""
+    return tuple(CAREERS[:n_classes]) + tuple(f"Career {i + 1}" for i in range(len(CAREERS), n_classes))
+
+
+# ====================== GENERATOR ======================
+class SyntheticCareerData:
+    """Seeded generator of career rows with a controllable class count, noise and correlation"""
+
+    def __init__(self, n_classes=20, noise=0.1, correlation=0.5, seed=0, banks=DEFAULT_BANKS):
+        if not 0.0 <= noise <= 1.0 or not 0.0 <= correlation <= 1.0:
+            raise ValueError("noise and correlation must be between 0 and 1")
+        self.noise = noise
+        self.correlation = correlation
+        self.seed = seed
+        self.categorical, self.numeric = build_schema(banks)
+        self.careers = np.array(career_names(n_classes), dtype=object)
+
+        # Each career's profile: a preferred value per categorical feature and a
+        # center per numeric one. Rows follow their career's profile with
+        # probability `correlation`, so features correlate through the career.
+        rng = np.random.default_rng(seed)
+        self.preferred = {col: rng.integers(len(values), size=n_classes) for col, values in self.categorical.items()}
+        self.centers = {col: rng.uniform(low, high, n_classes) for col, (low, high, _) in self.numeric.items()}
+
+    @property
+    def columns(self):
+        return [*self.categorical, *self.numeric, TARGET]
+
+    def _chunk(self, rows, index):
+        """Returns (career codes, {column: value codes}, {column: numbers}) of chunk index"""
+        rng = np.random.default_rng([self.seed, index])  # Chunks are independent and reproducible
+        labels = rng.integers(len(self.careers), size=rows)
+        codes = {}
+        for col, values in self.categorical.items():
+            follows = rng.random(rows) < self.correlation
+            codes[col] = np.where(follows, self.preferred[col][labels], rng.integers(len(values), size=rows))
+        numbers = {}
+        for col, (low, high, decimals) in self.numeric.items():
+            mixed = self.correlation * self.centers[col][labels] + (1 - self.correlation) * rng.uniform(low, high, rows)
+            numbers[col] = np.round(mixed, decimals) if decimals else np.rint(mixed).astype(np.int64)
+        noisy = rng.random(rows) < self.noise
+        labels[noisy] = rng.integers(len(self.careers), size=int(noisy.sum()))
+        return labels, codes, numbers
+
+    def _chunks(self, rows, chunk_rows):
+        for index, start in enumerate(range(0, rows, chunk_rows)):
+            yield self._chunk(min(chunk_rows, rows - start), index)
+
+    def frame(self, rows, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Returns rows as a DataFrame with the dataset's dtypes (text columns as str)"""
+        frames = []
+        for labels, codes, numbers in self._chunks(rows, chunk_rows):
+            columns = {col: np.array(self.categorical[col], dtype=object)[c] for col, c in codes.items()}
+            columns.update(numbers)
+            columns[TARGET] = self.careers[labels]
+            frames.append(pd.DataFrame(columns).astype({col: "str" for col in [*codes, TARGET]}))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=self.columns)
+
+    def write_parquet(self, path, rows, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Writes rows to a Parquet file, one row group per chunk; returns the file size"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        def text(codes, values):
+            # Dictionary-decoded by Arrow, without building Python strings per row
+            return pa.DictionaryArray.from_arrays(pa.array(codes, pa.int32()), pa.array(values)).cast(pa.string())
+
+        def write(tmp_path):
+            writer = None
+            for labels, codes, numbers in self._chunks(rows, chunk_rows):
+                arrays = {col: text(c, self.categorical[col]) for col, c in codes.items()}
+                arrays.update((col, pa.array(values)) for col, values in numbers.items())
+                arrays[TARGET] = text(labels, self.careers)
+                table = pa.table(arrays)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+            if writer is not None:
+                writer.close()
+
+        write_atomic(path, write)
+        return os.path.getsize(path)
+
+
+# ====================== CLI ======================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic career dataset for load tests.")
+    parser.add_argument("--rows", type=int, required=True, help="Rows to generate")
+    parser.add_argument("--output", required=True, help="Parquet file to write")
+    parser.add_argument("--classes", type=int, default=20, help="Number of careers")
+    parser.add_argument("--noise", type=float, default=0.1, help="Share of rows with a random career")
+    parser.add_argument("--correlation", type=float, default=0.5,
+                        help="Probability that a feature follows the row's career profile")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Rows generated per chunk")
+    parser.add_argument("--banks", default=",".join(DEFAULT_BANKS), help="Question banks whose features to use")
+    args = parser.parse_args(argv)
+    if args.classes < 1 or args.rows < 1 or args.chunk_rows < 1:
+        parser.error("--rows, --classes and --chunk-rows must be positive")
+
+    try:
+        generator = SyntheticCareerData(args.classes, args.noise, args.correlation, args.seed,
+                                        tuple(args.banks.split(",")))
+    except ValueError as exc:
+        parser.error(str(exc))
+    started = time.perf_counter()
+    size = generator.write_parquet(args.output, args.rows, args.chunk_rows)
+    print(f"Wrote {args.rows:,} rows x {len(generator.columns)} columns ({size / 1e6:.1f} MB) "
+          f"to {args.output} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
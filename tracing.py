@@ -0,0 +1,149 @@
+import json  # For the structured per-rerun log line
+import logging  # For emitting the per-rerun log line
+import os  # For the opt-in setting
+import sys  # For the log handler's stream
+import threading  # For the registry and window locks and the per-thread rerun
+import time  # For span durations
+from collections import deque  # For the rolling windows
+from contextlib import contextmanager, nullcontext  # For spans and their disabled form
+from functools import wraps  # For the traced decorator
+
+# ====================== TRACING ======================
+# Named spans time the stages of a rerun (loading, training, CSS, questions,
+# prediction...). Every span adds its duration to a process-wide registry that
+# keeps a rolling window per stage for percentiles, and spans opened inside a
+# rerun() are also summed into that rerun's log line. Tracing is opt-in
+# (CAREER_TRACING=1): when it is off, span() returns a shared no-op context
+# manager and traced() returns the function unchanged.
+
+ENABLED = os.environ.get("CAREER_TRACING", "").lower() in ("1", "true", "yes", "on")
+DEFAULT_WINDOW = 1000  # Durations kept per stage for the percentiles
+
+logger = logging.getLogger(__name__)
+_NULL_SPAN = nullcontext()
+
+
+class StageStats:
+    """Rolling window of the durations of one stage"""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.count = 0
+        self.durations = deque(maxlen=window)
+        self._lock = threading.Lock()  # Sessions record while others read the summary
+
+    def add(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.durations.append(seconds)
+
+    def summary(self):
+        """Returns the count and the last, p50, p90 and p99 durations in milliseconds"""
+        with self._lock:
+            count, durations = self.count, list(self.durations)
+        ordered = sorted(durations)
+        summary = {"count": count, "last_ms": durations[-1] * 1000 if durations else None}
+        for p in (50, 90, 99):
+            summary[f"p{p}_ms"] = ordered[min(len(ordered) - 1, len(ordered) * p // 100)] * 1000 if ordered else None
+        return summary
+
+
+class Tracer:
+    """Process-wide registry of stage timings"""
+
+    def __init__(self, enabled=ENABLED, window=DEFAULT_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()  # The rerun being recorded on this thread
+
+    def stage(self, name):
+        """Returns the StageStats of a stage, creating it on first use"""
+        stats = self._stages.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._stages.setdefault(name, StageStats(self.window))
+        return stats
+
+    def record(self, name, seconds):
+        """Adds one duration to a stage and to the current rerun, if any"""
+        self.stage(name).add(seconds)
+        rerun = getattr(self._local, "rerun", None)
+        if rerun is not None:
+            rerun[name] = rerun.get(name, 0.0) + seconds
+
+    def span(self, name):
+        """Context manager timing one stage (a shared no-op when tracing is off)"""
+        return self._span(name) if self.enabled else _NULL_SPAN
+
+    @contextmanager
+    def _span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def traced(self, name=None, rerun=False):
+        """Decorator timing every call of a function as a stage (named after it by default).
+
+        With rerun=True each call is recorded as a rerun, e.g. for fragments,
+        which Streamlit reruns on their own.
+        """
+        def decorate(fn):
+            if not self.enabled:
+                return fn
+            stage = name or fn.__qualname__
+            timer = self.rerun if rerun else self._span
+
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with timer(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def rerun(self, name):
+        """Context manager recording one rerun: a span that also logs the spans opened inside it.
+
+        Nested reruns (a fragment run as part of a full rerun) are plain spans.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        if getattr(self._local, "rerun", None) is not None:
+            return self._span(name)
+        return self._rerun(name)
+
+    @contextmanager
+    def _rerun(self, name):
+        self._local.rerun = spans = {}
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            total = time.perf_counter() - start
+            self._local.rerun = None
+            self.stage(name).add(total)
+            logger.info(json.dumps({
+                "event": "rerun", "name": name, "total_ms": round(total * 1000, 3),
+                "spans_ms": {stage: round(seconds * 1000, 3) for stage, seconds in spans.items()},
+            }))
+
+    def stats(self):
+        """Returns {stage: summary} for every stage recorded so far, sorted by name"""
+        with self._lock:
+            stages = dict(self._stages)  # New stages may be added meanwhile
+        return {name: stages[name].summary() for name in sorted(stages)}
+
+
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
+rerun = tracer.rerun
+
+if ENABLED and not logging.getLogger().handlers:
+    # Opting in means wanting the log lines, even where nothing configured logging
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
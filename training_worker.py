@@ -0,0 +1,107 @@
+import logging  # For reporting failed trainings
+import threading  # For the background training thread
+import time  # For training durations
+
+import metrics  # For exporting training durations and the served version
+import model_registry  # For loading and persisting trained bundles
+
+# ====================== BACKGROUND TRAINING ======================
+# A ModelPublisher owns the model that is currently served. It starts with the
+# newest artifact already on disk, retrains on a background thread whenever the
+# data version changes, and publishes the result by rebinding a single
+# attribute, so readers never take a lock and never see a half-built model.
+# The startup artifact is also loaded in the background: unpickling it imports
+# sklearn, which would otherwise hold up the first page render.
+
+logger = logging.getLogger(__name__)
+
+
+class ModelPublisher:
+    """Serves the latest trained bundle and refits it in the background when data changes"""
+
+    def __init__(self, name, params, train_fn):
+        self.name = name
+        self.params = params
+        self.train_fn = train_fn
+        self.last_error = None
+        self._data_version = None  # Data version of the newest training started
+        self._generation = 0  # Increases with every training started
+        self._refresh_lock = threading.Lock()
+        self._publish_lock = threading.Lock()  # Orders the startup artifact before any training result
+        self._idle = threading.Event()
+        self._idle.set()
+        self._loaded = threading.Event()  # Set once the startup artifact was looked up
+        self._bundle = None
+        metrics.track_publisher(self)
+        # Serve the newest compatible artifact as soon as it is deserialized
+        threading.Thread(target=self._load_latest, name=f"load-{name}", daemon=True).start()
+
+    @property
+    def bundle(self):
+        """The bundle currently served, or None before the first training finished"""
+        return self._bundle
+
+    @property
+    def is_training(self):
+        return not self._idle.is_set()
+
+    def refresh(self, data_version, load_df):
+        """Starts a background retrain if data_version changed; never blocks on a fit.
+
+        load_df() is called on the caller's thread, only when the version changed.
+        If it fails, the error is kept in last_error and the next refresh retries.
+        """
+        if data_version == self._data_version:
+            return
+        with self._refresh_lock:
+            if data_version == self._data_version:
+                return
+            try:
+                df = load_df()
+            except Exception as exc:
+                # The version is not recorded, so the next rerun loads the data again
+                self.last_error = exc
+                logger.exception("Loading the %s training data failed", self.name)
+                return
+            self._data_version = data_version
+            self._generation += 1
+            self._idle.clear()
+            threading.Thread(
+                target=self._train, args=(df, self._generation),
+                name=f"train-{self.name}", daemon=True,
+            ).start()
+
+    def wait(self, timeout=None):
+        """Blocks until the startup artifact is loaded and no training is running (for scripts and tests)"""
+        return self._loaded.wait(timeout) and self._idle.wait(timeout)
+
+    def _load_latest(self):
+        try:
+            bundle = model_registry.latest_bundle(self.name, self.params)
+        except Exception:
+            bundle = None
+            logger.exception("Loading the saved %s model failed", self.name)
+        with self._publish_lock:
+            if self._bundle is None:  # A training may already have published a newer one
+                self._bundle = bundle
+        self._loaded.set()
+
+    def _train(self, df, generation):
+        started = time.perf_counter()
+        try:
+            bundle = model_registry.load_or_train(self.name, df, self.params, self.train_fn)
+        except Exception as exc:
+            self.last_error = exc
+            logger.exception("Training %s failed; still serving the previous model", self.name)
+        else:
+            # Results of a training overtaken by newer data are dropped
+            if generation == self._generation:
+                with self._publish_lock:
+                    self._bundle = bundle  # Atomic swap: sessions pick it up on their next prediction
+                self.last_error = None
+                elapsed = time.perf_counter() - started
+                metrics.TRAINING_DURATION.observe(elapsed, self.name)
+                logger.info("Published %s model %s after %.2fs", self.name, bundle.version, elapsed)
+        finally:
+            if generation == self._generation:
+                self._idle.set()
@@ -0,0 +1,86 @@
+import numpy as np  # For the flat node arrays and batch traversal
+
+# ====================== COMPILED TREE INFERENCE ======================
+# sklearn's predict() validates its input and goes through pandas and Cython for
+# every call, which dwarfs the cost of walking a few tree levels. CompiledTree
+# copies the fitted tree_ arrays once and walks them directly on a plain
+# encoded answer vector (or a NumPy matrix for batches).
+
+# children_left/children_right value sklearn uses to mark a leaf
+TREE_LEAF = -1
+
+
+class CompiledTree:
+    """Flat-array copy of a fitted DecisionTreeClassifier"""
+
+    def __init__(self, estimator):
+        tree = estimator.tree_
+        value = tree.value[:, 0, :]
+        proba = value / value.sum(axis=1, keepdims=True)
+
+        self.classes = estimator.classes_
+        self.n_features = estimator.n_features_in_
+        self.n_leaves = tree.n_leaves
+
+        # NumPy arrays for batch traversal
+        self.feature_array = tree.feature.astype(np.intp)
+        self.threshold_array = tree.threshold.copy()
+        self.left_array = tree.children_left.astype(np.intp)
+        self.right_array = tree.children_right.astype(np.intp)
+        self.proba_array = proba
+
+        # Python lists for single rows: list indexing beats NumPy scalar access
+        self.feature = self.feature_array.tolist()
+        self.threshold = self.threshold_array.tolist()
+        self.left = self.left_array.tolist()
+        self.right = self.right_array.tolist()
+        self.leaf_class = self.classes[proba.argmax(axis=1)].tolist()
+
+    # ---------- single row ----------
+    def apply_one(self, x):
+        """Returns the leaf node index reached by one encoded answer vector"""
+        # sklearn compares float32 inputs against float64 thresholds
+        x = np.asarray(x, dtype=np.float32).tolist()
+        left, right, feature, threshold = self.left, self.right, self.feature, self.threshold
+        node = 0
+        while left[node] != TREE_LEAF:
+            node = left[node] if x[feature[node]] <= threshold[node] else right[node]
+        return node
+
+    def is_leaf(self, node):
+        """True if node has no children"""
+        return self.left[node] == TREE_LEAF
+
+    def step(self, node, value):
+        """Returns the child of an internal node for the encoded value of its split feature"""
+        value = float(np.float32(value))
+        return self.left[node] if value <= self.threshold[node] else self.right[node]
+
+    def predict_one(self, x):
+        """Returns the encoded class predicted for one answer vector"""
+        return self.leaf_class[self.apply_one(x)]
+
+    def predict_proba_one(self, x):
+        """Returns the class probabilities for one answer vector"""
+        return self.proba_array[self.apply_one(x)]
+
+    # ---------- batches ----------
+    def apply(self, X):
+        """Returns the leaf node index for every row of an encoded matrix"""
+        X = np.asarray(X, dtype=np.float32)
+        nodes = np.zeros(X.shape[0], dtype=np.intp)
+        active = np.flatnonzero(self.left_array[nodes] != TREE_LEAF)
+        while active.size:
+            current = nodes[active]
+            go_left = X[active, self.feature_array[current]] <= self.threshold_array[current]
+            nodes[active] = np.where(go_left, self.left_array[current], self.right_array[current])
+            active = active[self.left_array[nodes[active]] != TREE_LEAF]
+        return nodes
+
+    def predict(self, X):
+        """Returns the encoded class predicted for every row"""
+        return self.classes[self.proba_array[self.apply(X)].argmax(axis=1)]
+
+    def predict_proba(self, X):
+        """Returns the class probabilities for every row"""
+        return self.proba_array[self.apply(X)]